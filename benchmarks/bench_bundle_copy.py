@@ -0,0 +1,75 @@
+"""Vergelijk move_bundle() met het shutil.move kopieerpad op een synthetische bundle.
+
+Gebruik (bron en doel bij voorkeur op verschillende volumes):
+
+    python3 benchmarks/bench_bundle_copy.py --files 50000 --src /tmp --dst /Volumes/EXTERN
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bundle_copy import COPY_WORKERS, move_bundle  # noqa: E402
+
+
+def make_bundle(root: str, files: int, size: int, per_dir: int = 200) -> str:
+    """Bouw een bundle met `files` bestanden van `size` bytes, verdeeld over submappen"""
+    bundle = os.path.join(root, "Bench.app")
+    payload = os.urandom(size)
+    for i in range(files):
+        d = os.path.join(bundle, "Contents", "Resources", f"d{i // per_dir:04d}")
+        if i % per_dir == 0:
+            os.makedirs(d)
+        with open(os.path.join(d, f"f{i:06d}.bin"), 'wb') as f:
+            f.write(payload)
+    os.symlink("Contents/Resources", os.path.join(bundle, "Resources"))
+    return bundle
+
+
+def shutil_move_copy(src: str, dst: str):
+    # Dit doet shutil.move voor een map op een ander volume
+    shutil.copytree(src, dst, symlinks=True)
+    shutil.rmtree(src)
+
+
+def run(args) -> dict:
+    results = {"files": args.files, "size": args.size, "workers": args.workers}
+    with tempfile.TemporaryDirectory(dir=args.src) as src_root, \
+            tempfile.TemporaryDirectory(dir=args.dst) as dst_root:
+        for name, fn in (("shutil_move", shutil_move_copy),
+                         ("move_bundle", lambda s, d: move_bundle(s, d, args.workers))):
+            src = make_bundle(src_root, args.files, args.size)
+            dst = os.path.join(dst_root, "Bench.app")
+            start = time.perf_counter()
+            fn(src, dst)
+            results[name] = time.perf_counter() - start
+            shutil.rmtree(dst)
+    results["speedup"] = results["shutil_move"] / results["move_bundle"] if results["move_bundle"] else None
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=50000)
+    parser.add_argument("--size", type=int, default=4096, help="bytes per bestand")
+    parser.add_argument("--workers", type=int, default=COPY_WORKERS)
+    parser.add_argument("--src", default=None, help="map voor de bron-bundle")
+    parser.add_argument("--dst", default=None, help="map voor de kopie")
+    parser.add_argument("--json", action="store_true", help="uitvoer als JSON")
+    args = parser.parse_args()
+    results = run(args)
+    if args.json:
+        print(json.dumps(results))
+    else:
+        print(f"{args.files} bestanden van {args.size} bytes")
+        print(f"shutil.move : {results['shutil_move']:.2f}s")
+        print(f"move_bundle : {results['move_bundle']:.2f}s ({args.workers} threads, {results['speedup']:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Bewaakt de opstarttijd van het headless pad (zonder Textual).
+
+Meet de mediane tijd van een verse interpreter die symlink_checker en
+symlink_cli importeert, min de tijd van een lege interpreter, en faalt
+(exitcode 1) als dat boven het budget komt of als Textual toch geladen
+wordt:
+
+    python3 benchmarks/bench_import.py --budget-ms 150
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEADLESS_IMPORT = (
+    "import sys, symlink_checker, symlink_cli\n"
+    "sys.exit(1 if any(name == 'textual' or name.startswith('textual.') for name in sys.modules) else 0)\n"
+)
+BUDGET_MS = 150
+
+
+def _time_interpreter(code: str, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT)
+        timings.append(time.perf_counter() - start)
+        if proc.returncode != 0:
+            raise SystemExit("❌ Textual wordt geladen op het headless pad")
+    return statistics.median(timings)
+
+
+def run(runs: int) -> dict:
+    bare = _time_interpreter("pass", runs)
+    headless = _time_interpreter(HEADLESS_IMPORT, runs)
+    return {
+        "runs": runs,
+        "bare_ms": bare * 1000,
+        "headless_ms": headless * 1000,
+        "import_ms": (headless - bare) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=9)
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    parser.add_argument("--json", action="store_true", help="uitvoer als JSON")
+    args = parser.parse_args()
+    results = run(args.runs)
+    results["budget_ms"] = args.budget_ms
+    results["ok"] = results["import_ms"] <= args.budget_ms
+    if args.json:
+        print(json.dumps(results))
+    else:
+        print(f"Headless import: {results['import_ms']:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    sys.exit(0 if results["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Bouw een synthetische app-bibliotheek voor benchmarks.
+
+Maakt onder `root` een SYMLINKED map met N .app bundles en een
+Applications map met een mix van geldige symlinks, dode symlinks,
+ontbrekende items, symlinks naar een verkeerd doel en door een updater
+vervangen echte bundles, plus een skiplist.txt. Met dezelfde --seed
+ontstaat steeds dezelfde boom.
+
+    python3 benchmarks/make_fixture.py /tmp/fixture --bundles 10000 --files 0
+    python3 benchmarks/make_fixture.py /dev/shm/fx --bundles 1000 --files 50 --depth 3 --apps-dir /tmp/fx-apps
+
+Gebruik een lege of nog niet bestaande map; --force ruimt hem eerst op.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+from typing import Dict, List, Optional
+
+VENDORS = ("Adobe", "Microsoft", "Setapp", "JetBrains", "Google", "Affinity", "Acme", "Vendor")
+# Aandeel van de bundles per soort; de rest wordt een geldige symlink
+DEFAULT_MIX = {"dangling": 0.02, "missing": 0.03, "wrong_target": 0.01, "replaced": 0.04}
+
+
+def app_name(i: int) -> str:
+    return f"{VENDORS[i % len(VENDORS)]} App {i:06d}.app"
+
+
+def write_bundle(bundle: str, files: int, payload: bytes, depth: int, per_dir: int = 100, changed: int = 0):
+    """Schrijf een bundle met `files` bestanden verdeeld over mappen van `depth` niveaus diep"""
+    contents = os.path.join(bundle, "Contents")
+    os.makedirs(os.path.join(contents, "MacOS"))
+    with open(os.path.join(contents, "Info.plist"), 'w') as f:
+        f.write(f"<plist><dict><key>CFBundleName</key><string>{os.path.basename(bundle)}</string></dict></plist>\n")
+    if files <= 0:
+        return
+    with open(os.path.join(contents, "MacOS", "main"), 'wb') as f:
+        f.write(payload)
+    for i in range(files - 1):
+        # Elke `per_dir` bestanden een nieuwe map; elk niveau heeft maximaal 10 submappen
+        group = i // per_dir
+        parts = [f"d{group // 10 ** level % 10}" for level in range(max(depth, 1))]
+        d = os.path.join(contents, "Resources", *parts)
+        os.makedirs(d, exist_ok=True)
+        with open(os.path.join(d, f"f{i:06d}.bin"), 'wb') as f:
+            # De eerste `changed` bestanden verschillen, zoals na een update
+            f.write(payload[::-1] if i < changed else payload)
+    # Een relatieve symlink binnen de bundle, zoals bij frameworks
+    os.symlink("Contents/Resources", os.path.join(bundle, "Resources"))
+
+
+def make_fixture(root: str, bundles: int = 1000, files: int = 5, file_size: int = 1024, depth: int = 2,
+                 mix: Optional[Dict[str, float]] = None, skip: int = 10, skip_patterns: int = 1,
+                 seed: int = 1, apps_dir: Optional[str] = None, symlinked_dir: Optional[str] = None) -> dict:
+    """Bouw de boom en geef een beschrijving met paden en aantallen per soort"""
+    rng = random.Random(seed)
+    mix = dict(DEFAULT_MIX if mix is None else mix)
+    symlinked_dir = symlinked_dir or os.path.join(root, "SYMLINKED")
+    apps_dir = apps_dir or os.path.join(root, "Applications")
+    os.makedirs(symlinked_dir, exist_ok=True)
+    os.makedirs(apps_dir, exist_ok=True)
+    payload = rng.randbytes(file_size)
+
+    names = [app_name(i) for i in range(bundles)]
+    order = list(range(bundles))
+    rng.shuffle(order)
+    kinds: List[str] = ["valid"] * bundles
+    start = 0
+    for kind, share in mix.items():
+        count = int(bundles * share)
+        for i in order[start:start + count]:
+            kinds[i] = kind
+        start += count
+
+    counts = {"valid": 0, **{kind: 0 for kind in mix}}
+    for name, kind in zip(names, kinds):
+        source = os.path.join(symlinked_dir, name)
+        link = os.path.join(apps_dir, name)
+        counts[kind] += 1
+        if kind == "dangling":
+            # De kopie in SYMLINKED staat op een volume dat er niet meer is
+            os.symlink(os.path.join("/Volumes/Ontbreekt", name), source)
+            os.symlink(source, link)
+            continue
+        write_bundle(source, files, payload, depth)
+        if kind == "valid":
+            os.symlink(source, link)
+        elif kind == "wrong_target":
+            os.symlink(os.path.join("/Volumes/Oud", name), link)
+        elif kind == "replaced":
+            write_bundle(link, files, payload, depth, changed=max(1, files // 10))
+
+    skiplist_file = os.path.join(root, "skiplist.txt")
+    skipped = rng.sample(names, min(skip, bundles))
+    patterns = [f"{vendor}*.app" for vendor in VENDORS[:skip_patterns]]
+    with open(skiplist_file, 'w') as f:
+        f.write("\n".join(sorted(skipped) + patterns) + "\n")
+
+    return {
+        "root": root,
+        "symlinked_dir": symlinked_dir,
+        "apps_dir": apps_dir,
+        "skiplist_file": skiplist_file,
+        "bundles": bundles,
+        "files_per_bundle": files,
+        "file_size": file_size,
+        "depth": depth,
+        "seed": seed,
+        "counts": counts,
+        "skiplist": {"names": len(skipped), "patterns": patterns},
+    }
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = dict(DEFAULT_MIX)
+    for part in filter(None, text.split(",")):
+        kind, _, share = part.partition("=")
+        if kind not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"onbekende soort: {kind} (kies uit {', '.join(DEFAULT_MIX)})")
+        mix[kind] = float(share)
+    if sum(mix.values()) > 1:
+        raise argparse.ArgumentTypeError("de aandelen zijn samen meer dan 1")
+    return mix
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("root", help="map waarin de fixture gebouwd wordt")
+    parser.add_argument("--bundles", type=int, default=1000)
+    parser.add_argument("--files", type=int, default=5, help="bestanden per bundle (0: alleen Info.plist)")
+    parser.add_argument("--file-size", type=int, default=1024, help="bytes per bestand")
+    parser.add_argument("--depth", type=int, default=2, help="aantal mapniveaus onder Contents/Resources")
+    parser.add_argument("--mix", type=parse_mix, default=dict(DEFAULT_MIX),
+                        help="aandelen per soort, bijv. dangling=0.02,missing=0.03,wrong_target=0.01,replaced=0.04")
+    parser.add_argument("--skip", type=int, default=10, help="aantal exacte namen in skiplist.txt")
+    parser.add_argument("--skip-patterns", type=int, default=1, help="aantal glob-patronen in skiplist.txt")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--apps-dir", help="Applications op een andere plek, bijv. een ander volume")
+    parser.add_argument("--symlinked-dir", help="SYMLINKED op een andere plek")
+    parser.add_argument("--force", action="store_true", help="bestaande mappen eerst verwijderen")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    paths = [args.root, args.apps_dir, args.symlinked_dir]
+    for path in filter(None, paths):
+        if os.path.lexists(path) and os.listdir(path):
+            if not args.force:
+                print(f"❌ {path} is niet leeg (gebruik --force)", file=sys.stderr)
+                return 1
+            shutil.rmtree(path)
+    os.makedirs(args.root, exist_ok=True)
+    info = make_fixture(args.root, args.bundles, args.files, args.file_size, args.depth, args.mix,
+                        args.skip, args.skip_patterns, args.seed, args.apps_dir, args.symlinked_dir)
+    print(json.dumps(info, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,320 @@
+"""Benchmarksuite voor scan-, classificatie- en hersteldoorvoer.
+
+Bouwt per schaal een synthetische bibliotheek (zie make_fixture.py) en meet
+lijsten, classificeren, skiplist-matching, rename op hetzelfde volume,
+verplaatsen naar een ander volume, rmtree en complete headless runs. De
+uitvoer is JSON zodat runs van verschillende commits te vergelijken zijn:
+
+    python3 benchmarks/run_benchmarks.py --scales 1000,10000 --out before.json
+    python3 benchmarks/run_benchmarks.py --scales 1000,10000 --out after.json --compare before.json
+
+Met --compare wordt per meting de verhouding nieuw/oud getoond; de exitcode
+is 1 als een meting meer dan --threshold keer zo traag is geworden.
+Verplaatsen naar een ander volume wordt alleen gemeten met --xdev-dir op
+een ander volume dan --workdir (bijv. /dev/shm). De groep latency draait
+scan en herstel tegen een MemoryFS achter een LatencyFS (zie filesystem.py),
+zodat het effect van --latency-workers op een trage externe schijf ook
+zonder zo'n schijf te meten is.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import symlink_config  # noqa: E402
+from bundle_copy import move_bundle  # noqa: E402
+from filesystem import LatencyFS, MemoryFS  # noqa: E402
+from make_fixture import app_name, make_fixture, write_bundle  # noqa: E402
+from skiplist_matcher import Skiplist  # noqa: E402
+from symlink_cli import run_headless  # noqa: E402
+from symlink_engine import index_dir, iter_scan, list_items  # noqa: E402
+from trash_reaper import remove_tree  # noqa: E402
+
+THRESHOLD = 1.2
+
+
+class Suite:
+    def __init__(self, workdir: str, repeat: int):
+        self.workdir = workdir
+        self.repeat = repeat
+        self.results = []
+
+    def measure(self, name: str, scale: int, fn: Callable[[object], object],
+                setup: Optional[Callable[[], object]] = None, items: Optional[int] = None):
+        """Voer `fn(setup())` `repeat` keer uit en bewaar de mediane tijd; setup telt niet mee"""
+        timings = []
+        for _ in range(self.repeat):
+            arg = setup() if setup is not None else None
+            start = time.perf_counter()
+            fn(arg)
+            timings.append(time.perf_counter() - start)
+        seconds = statistics.median(timings)
+        items = scale if items is None else items
+        result = {
+            "name": name,
+            "scale": scale,
+            "seconds": seconds,
+            "min_seconds": min(timings),
+            "runs": len(timings),
+            "items_per_second": items / seconds if seconds > 0 else None,
+        }
+        self.results.append(result)
+        print(f"{name:<24} {scale:>8} {seconds * 1000:>10.1f} ms", file=sys.stderr)
+
+    def fresh_dir(self, name: str) -> str:
+        path = os.path.join(self.workdir, name)
+        if os.path.lexists(path):
+            shutil.rmtree(path)
+        os.makedirs(path)
+        return path
+
+
+def _drain(iterator):
+    for _ in iterator:
+        pass
+
+
+def bench_scan(suite: Suite, scale: int, files: int):
+    """Lijsten, classificeren en skiplist-matching op één fixture (alleen lezen)"""
+    info = make_fixture(suite.fresh_dir(f"scan-{scale}"), bundles=scale, files=files)
+    symlinked_dir, apps_dir = info["symlinked_dir"], info["apps_dir"]
+    with open(info["skiplist_file"]) as f:
+        entries = [line.strip() for line in f if line.strip()]
+
+    suite.measure("list.listdir", scale, lambda _: list_items(symlinked_dir))
+    suite.measure("list.scandir_index", scale, lambda _: (index_dir(symlinked_dir), index_dir(apps_dir)))
+    suite.measure("classify.join", scale,
+                  lambda _: _drain(iter_scan(symlinked_dir, apps_dir, entries, repair=False)))
+    suite.measure("classify.lookup", scale,
+                  lambda _: _drain(iter_scan(symlinked_dir, apps_dir, entries, repair=False, join=False)))
+    suite.measure("classify.verify_target", scale,
+                  lambda _: _drain(iter_scan(symlinked_dir, apps_dir, entries, repair=False, verify_target=True)))
+
+    names = list_items(symlinked_dir)
+    # Realistische skiplist plus een flink aantal patronen
+    matcher = Skiplist(entries + [f"Vendor{i}*.app" for i in range(200)] + ["re:^Microsoft .* [0-9]+\\.app$"])
+    suite.measure("skiplist.compile", scale, lambda _: Skiplist(matcher.entries), items=len(matcher.entries))
+    suite.measure("skiplist.match", scale, lambda _: sum(name in matcher for name in names))
+
+
+def bench_moves(suite: Suite, bundles: int, files: int, file_size: int, xdev_dir: Optional[str]):
+    """Verplaatsen en verwijderen van `bundles` bundles met elk `files` bestanden"""
+    payload = os.urandom(file_size)
+
+    def make_bundles(name: str) -> List[str]:
+        base = suite.fresh_dir(name)
+        paths = [os.path.join(base, f"B{i:04d}.app") for i in range(bundles)]
+        for path in paths:
+            write_bundle(path, files, payload, depth=2)
+        return paths
+
+    def rename_all(paths):
+        for path in paths:
+            os.rename(path, path + ".moved")
+
+    suite.measure("move.rename", bundles, rename_all, lambda: make_bundles("rename"))
+    suite.measure("rmtree.shutil", bundles, lambda paths: [shutil.rmtree(p) for p in paths],
+                  lambda: make_bundles("rmtree"))
+    suite.measure("rmtree.remove_tree", bundles, lambda paths: [remove_tree(p) for p in paths],
+                  lambda: make_bundles("rmtree"))
+
+    if xdev_dir is None or os.stat(xdev_dir).st_dev == os.stat(suite.workdir).st_dev:
+        print("move.cross_device overgeslagen: geef --xdev-dir op een ander volume", file=sys.stderr)
+        return
+    target = os.path.join(xdev_dir, "symlink-checker-bench")
+
+    def setup_xdev():
+        if os.path.lexists(target):
+            shutil.rmtree(target)
+        os.makedirs(target)
+        return make_bundles("xdev")
+
+    def move_all(paths):
+        for path in paths:
+            move_bundle(path, os.path.join(target, os.path.basename(path)))
+
+    suite.measure("move.cross_device", bundles, move_all, setup_xdev)
+    shutil.rmtree(target, ignore_errors=True)
+
+
+def bench_headless(suite: Suite, scale: int, files: int):
+    """Complete headless runs zoals `symlink_cli.py --headless`, met en zonder herstel"""
+    def setup(incremental=False):
+        info = make_fixture(suite.fresh_dir(f"headless-{scale}"), bundles=scale, files=files)
+        # Skiplist en scan-snapshot van de fixture gebruiken, niet die naast het script
+        symlink_config.SKIPLIST_FILE = info["skiplist_file"]
+        symlink_config.STATE_FILE = os.path.join(suite.workdir, "scan_state.json")
+        return {
+            "symlinked_dir": info["symlinked_dir"],
+            "apps_dir": info["apps_dir"],
+            "incremental": incremental,
+            "deferred_delete": False,
+        }
+
+    out = open(os.devnull, 'w')
+    suite.measure("headless.check", scale, lambda config: run_headless(config, repair=False, out=out), setup)
+    suite.measure("headless.repair", scale, lambda config: run_headless(config, repair=True, out=out), setup)
+
+    def setup_incremental():
+        config = setup(incremental=True)
+        if os.path.exists(symlink_config.STATE_FILE):
+            os.remove(symlink_config.STATE_FILE)
+        run_headless(config, repair=False, out=out)
+        return config
+
+    # Tweede run zonder wijzigingen: de snapshot slaat het lezen van de mappen over
+    suite.measure("headless.incremental", scale,
+                  lambda config: run_headless(config, repair=False, out=out), setup_incremental)
+    out.close()
+
+
+def build_memory_fixture(bundles: int, files: int, replaced: float = 0.1) -> MemoryFS:
+    """Bibliotheek in het geheugen met SYMLINKED op een apart volume; `replaced` deel is een echte bundle"""
+    fs = MemoryFS()
+    fs.mount("/Volumes/Extern/SYMLINKED")
+    fs.makedirs("/Applications")
+    step = max(1, round(1 / replaced)) if replaced > 0 else 0
+    for i in range(bundles):
+        name = app_name(i)
+        source = os.path.join("/Volumes/Extern/SYMLINKED", name)
+        link = os.path.join("/Applications", name)
+        fs.makedirs(source)
+        if step and i % step == 0:
+            fs.makedirs(os.path.join(link, "Contents"))
+            for j in range(files):
+                fs.write_file(os.path.join(link, "Contents", f"f{j:04d}.bin"), 64 * 1024)
+        else:
+            fs.symlink(source, link)
+    return fs
+
+
+def bench_latency(suite: Suite, bundles: int, files: int, latency: float, jitter: float,
+                  bytes_per_second: float, workers: List[int]):
+    """Scan en herstel tegen een gesimuleerde trage externe schijf, per aantal herstelthreads"""
+    symlinked_dir, apps_dir = "/Volumes/Extern/SYMLINKED", "/Applications"
+
+    def slow_fs():
+        return LatencyFS(build_memory_fixture(bundles, files), latency, jitter, bytes_per_second,
+                         paths=["/Volumes/Extern"], seed=1)
+
+    suite.measure("latency.check", bundles,
+                  lambda fs: _drain(iter_scan(symlinked_dir, apps_dir, repair=False, verify_target=True, fs=fs)),
+                  slow_fs)
+    for count in workers:
+        suite.measure(f"latency.repair.w{count}", bundles,
+                      lambda fs: _drain(iter_scan(symlinked_dir, apps_dir, repair=True, repair_workers=count,
+                                                  fs=fs)),
+                      slow_fs)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(new: dict, old: dict, threshold: float) -> bool:
+    """Toon nieuw/oud per meting; geeft False als iets meer dan `threshold` trager is"""
+    old_by_key = {(r["name"], r["scale"]): r for r in old["results"]}
+    ok = True
+    print(f"{'meting':<24} {'schaal':>8} {'oud ms':>10} {'nieuw ms':>10} {'ratio':>7}", file=sys.stderr)
+    for result in new["results"]:
+        before = old_by_key.get((result["name"], result["scale"]))
+        if before is None:
+            continue
+        ratio = result["seconds"] / before["seconds"] if before["seconds"] > 0 else float("inf")
+        flag = ""
+        if ratio > threshold:
+            flag = "  ❌ trager"
+            ok = False
+        print(f"{result['name']:<24} {result['scale']:>8} {before['seconds'] * 1000:>10.1f} "
+              f"{result['seconds'] * 1000:>10.1f} {ratio:>7.2f}{flag}", file=sys.stderr)
+    return ok
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default="1000,10000", help="aantallen bundles, komma-gescheiden")
+    parser.add_argument("--files", type=int, default=5, help="bestanden per bundle in de fixtures")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--move-bundles", type=int, default=50, help="bundles voor de move/rmtree metingen")
+    parser.add_argument("--move-files", type=int, default=200, help="bestanden per bundle voor move/rmtree")
+    parser.add_argument("--move-file-size", type=int, default=16 * 1024)
+    parser.add_argument("--latency-bundles", type=int, default=200, help="bundles voor de latency metingen")
+    parser.add_argument("--latency-files", type=int, default=20, help="bestanden per vervangen bundle")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="vertraging per aanroep op de trage schijf")
+    parser.add_argument("--jitter-ms", type=float, default=2.0)
+    parser.add_argument("--latency-mbps", type=float, default=30.0, help="kopieersnelheid van de trage schijf")
+    parser.add_argument("--latency-workers", default="1,4,8", help="aantallen herstelthreads, komma-gescheiden")
+    parser.add_argument("--only", help="alleen deze groepen: scan, moves, headless, latency (komma-gescheiden)")
+    parser.add_argument("--workdir", help="map voor de fixtures (standaard een tijdelijke map)")
+    parser.add_argument("--xdev-dir", help="map op een ander volume voor move.cross_device")
+    parser.add_argument("--out", help="schrijf de resultaten als JSON naar dit bestand (anders stdout)")
+    parser.add_argument("--compare", help="eerder JSON-resultaat om mee te vergelijken")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    scales = [int(scale) for scale in args.scales.split(",") if scale]
+    groups = set(args.only.split(",")) if args.only else {"scan", "moves", "headless", "latency"}
+    workdir = args.workdir or tempfile.mkdtemp(prefix="symlink-checker-bench-")
+    os.makedirs(workdir, exist_ok=True)
+    suite = Suite(workdir, args.repeat)
+    try:
+        for scale in scales:
+            if "scan" in groups:
+                bench_scan(suite, scale, args.files)
+            if "headless" in groups:
+                bench_headless(suite, scale, args.files)
+        if "moves" in groups:
+            bench_moves(suite, args.move_bundles, args.move_files, args.move_file_size, args.xdev_dir)
+        if "latency" in groups:
+            workers = [int(count) for count in args.latency_workers.split(",") if count]
+            bench_latency(suite, args.latency_bundles, args.latency_files, args.latency_ms / 1000,
+                          args.jitter_ms / 1000, args.latency_mbps * 1_000_000, workers)
+    finally:
+        if args.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "settings": {"scales": scales, "files": args.files, "repeat": args.repeat,
+                     "move_bundles": args.move_bundles, "move_files": args.move_files,
+                     "move_file_size": args.move_file_size, "latency_bundles": args.latency_bundles,
+                     "latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms},
+        "results": suite.results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        return 0 if compare(report, old, args.threshold) else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""Parallelle kopie van app bundles naar een ander volume.
+
+App bundles bestaan uit tienduizenden kleine bestanden; shutil.copytree
+kopieert die één voor één. copy_bundle() maakt eerst alle mappen en interne
+symlinks aan en kopieert daarna de bestanden met een threadpool, waar
+mogelijk zonder tussenbuffer (copy_file_range, of sendfile/fcopyfile via
+shutil.copyfile).
+"""
+import errno
+import os
+import shutil
+import threading
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+# Voorstel voor `copy_workers`; standaard staat de parallelle kopie uit,
+# want alleen op tmpfs gemeten en daar trager dan shutil.move
+COPY_WORKERS = 8
+
+_HAS_COPY_FILE_RANGE = hasattr(os, "copy_file_range")
+# Fouten waarbij copy_file_range niet beschikbaar is en we terugvallen op shutil.copyfile
+_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF}
+
+
+@dataclass
+class CopyStats:
+    files: int = 0
+    dirs: int = 0
+    symlinks: int = 0
+    bytes_copied: int = 0
+
+
+def _copy_file_range(src: str, dst: str, size: int):
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        remaining = size
+        while remaining > 0:
+            sent = os.copy_file_range(fsrc.fileno(), fdst.fileno(), min(remaining, 1 << 30))
+            if sent == 0:
+                break
+            remaining -= sent
+
+
+def copy_file(src: str, dst: str, size: int):
+    """Kopieer inhoud, rechten en tijden van één bestand"""
+    if _HAS_COPY_FILE_RANGE and size > 0:
+        try:
+            _copy_file_range(src, dst, size)
+        except OSError as e:
+            if e.errno not in _FALLBACK_ERRNOS:
+                raise
+            shutil.copyfile(src, dst)
+    else:
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
+
+def _plan(src: str, dst: str, stats: CopyStats) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str, int]]]:
+    """Eerste pass: maak mappen en symlinks aan en verzamel de te kopiëren bestanden"""
+    dirs = [(src, dst)]
+    files = []
+    os.mkdir(dst)
+    stats.dirs += 1
+    stack = [(src, dst)]
+    while stack:
+        src_dir, dst_dir = stack.pop()
+        with os.scandir(src_dir) as it:
+            for entry in it:
+                target = os.path.join(dst_dir, entry.name)
+                if entry.is_symlink():
+                    os.symlink(os.readlink(entry.path), target)
+                    shutil.copystat(entry.path, target, follow_symlinks=False)
+                    stats.symlinks += 1
+                elif entry.is_dir(follow_symlinks=False):
+                    os.mkdir(target)
+                    stats.dirs += 1
+                    dirs.append((entry.path, target))
+                    stack.append((entry.path, target))
+                else:
+                    files.append((entry.path, target, entry.stat(follow_symlinks=False).st_size))
+    return dirs, files
+
+
+def copy_bundle(src: str, dst: str, workers: int = COPY_WORKERS,
+                on_copied: Optional[Callable[[int], None]] = None) -> CopyStats:
+    """Kopieer de map `src` naar het nog niet bestaande `dst`.
+
+    Interne symlinks blijven symlinks; rechten en tijden worden overgenomen.
+    `on_copied` krijgt na elk bestand het totaal aantal gekopieerde bytes en
+    kan vanuit meerdere threads aangeroepen worden.
+    """
+    stats = CopyStats()
+    dirs, files = _plan(src, dst, stats)
+    lock = threading.Lock()
+
+    def copy_one(job):
+        src_path, dst_path, size = job
+        copy_file(src_path, dst_path, size)
+        with lock:
+            stats.files += 1
+            stats.bytes_copied += size
+            copied = stats.bytes_copied
+        if on_copied is not None:
+            on_copied(copied)
+
+    if workers <= 1:
+        for job in files:
+            copy_one(job)
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="copy") as pool:
+            futures = [pool.submit(copy_one, job) for job in files]
+            done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in not_done:
+                future.cancel()
+            for future in done:
+                future.result()
+
+    # Maptijden pas na de bestanden zetten, diepste mappen eerst
+    for src_dir, dst_dir in reversed(dirs):
+        shutil.copystat(src_dir, dst_dir)
+    return stats
+
+
+def move_bundle(src: str, dst: str, workers: int = COPY_WORKERS,
+                on_copied: Optional[Callable[[int], None]] = None) -> CopyStats:
+    """Verplaats een bundle naar een ander volume: parallel kopiëren, dan bron verwijderen.
+
+    Bij een fout wordt de half gekopieerde `dst` opgeruimd en blijft `src` intact.
+    """
+    if os.path.lexists(dst):
+        raise FileExistsError(errno.EEXIST, "Bestemming bestaat al", dst)
+    try:
+        stats = copy_bundle(src, dst, workers, on_copied)
+    except BaseException:
+        shutil.rmtree(dst, ignore_errors=True)
+        raise
+    shutil.rmtree(src)
+    return stats
@@ -0,0 +1,659 @@
+"""Bestandssysteemlaag voor de engine.
+
+De scan- en herstelcode praat via een FileSystem-object in plaats van
+direct met os/shutil, zodat hetzelfde pad ook tegen een bestandssysteem in
+het geheugen of een kunstmatig traag volume kan draaien:
+
+- RealFS: het echte bestandssysteem (standaard)
+- MemoryFS: een boom in het geheugen, met losse "volumes" via mount()
+- LatencyFS: wikkelt een ander FileSystem en wacht per aanroep een
+  instelbare tijd met jitter, zoals een USB-schijf die moet opspinnen
+- CountingFS: wikkelt een ander FileSystem en meldt elke aanroep met zijn
+  duur, voor de tellers in run_stats.py
+
+Paden blijven gewone strings; entries uit scandir() gedragen zich als
+os.DirEntry (name, path, is_dir, is_symlink, inode, stat).
+"""
+import errno
+import os
+import random
+import shutil
+import stat
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from bundle_copy import COPY_WORKERS, move_bundle
+
+CopiedCallback = Callable[[int], None]
+
+
+class FileSystem:
+    """Interface; de methodes volgen de namen en semantiek van os en shutil"""
+
+    # True als paden echte OS-paden zijn, zodat delta-sync en de TrashReaper gebruikt kunnen worden
+    native = False
+
+    def scandir(self, path: str) -> list:
+        raise NotImplementedError
+
+    def listdir(self, path: str) -> List[str]:
+        return [entry.name for entry in self.scandir(path)]
+
+    def lstat(self, path: str) -> os.stat_result:
+        raise NotImplementedError
+
+    def stat(self, path: str) -> os.stat_result:
+        raise NotImplementedError
+
+    def readlink(self, path: str) -> str:
+        raise NotImplementedError
+
+    def exists(self, path: str) -> bool:
+        try:
+            self.stat(path)
+        except OSError:
+            return False
+        return True
+
+    def is_real_dir(self, path: str) -> bool:
+        """Een echte map, geen symlink ernaar"""
+        try:
+            return stat.S_ISDIR(self.lstat(path).st_mode)
+        except OSError:
+            return False
+
+    def symlink(self, target: str, path: str):
+        raise NotImplementedError
+
+    def mkdir(self, path: str):
+        raise NotImplementedError
+
+    def copy_file(self, src: str, dst: str):
+        """Kopieer één bestand of symlink (niet gevolgd) met zijn mtime, zoals shutil.copy2"""
+        raise NotImplementedError
+
+    def copystat(self, src: str, dst: str):
+        """Neem de mtime (en rechten) van `src` over, zonder symlinks te volgen"""
+        raise NotImplementedError
+
+    def rename(self, src: str, dst: str):
+        raise NotImplementedError
+
+    def replace(self, src: str, dst: str):
+        raise NotImplementedError
+
+    def remove(self, path: str):
+        raise NotImplementedError
+
+    def rmtree(self, path: str):
+        raise NotImplementedError
+
+    def move(self, src: str, dst: str, workers: int = COPY_WORKERS,
+             on_copied: Optional[CopiedCallback] = None) -> int:
+        """Verplaats naar een ander volume (kopiëren + bron verwijderen); geeft het aantal bytes"""
+        raise NotImplementedError
+
+
+class RealFS(FileSystem):
+    native = True
+
+    def scandir(self, path):
+        with os.scandir(path) as it:
+            return list(it)
+
+    def listdir(self, path):
+        return os.listdir(path)
+
+    def lstat(self, path):
+        return os.lstat(path)
+
+    def stat(self, path):
+        return os.stat(path)
+
+    def readlink(self, path):
+        return os.readlink(path)
+
+    def exists(self, path):
+        return os.path.exists(path)
+
+    def symlink(self, target, path):
+        os.symlink(target, path)
+
+    def mkdir(self, path):
+        os.mkdir(path)
+
+    def copy_file(self, src, dst):
+        shutil.copy2(src, dst, follow_symlinks=False)
+
+    def copystat(self, src, dst):
+        shutil.copystat(src, dst, follow_symlinks=False)
+
+    def rename(self, src, dst):
+        os.rename(src, dst)
+
+    def replace(self, src, dst):
+        os.replace(src, dst)
+
+    def remove(self, path):
+        os.remove(path)
+
+    def rmtree(self, path):
+        shutil.rmtree(path)
+
+    def move(self, src, dst, workers=COPY_WORKERS, on_copied=None):
+        if workers > 0 and self.is_real_dir(src):
+            return move_bundle(src, dst, workers, on_copied).bytes_copied
+        size = tree_size(self, src)
+        shutil.move(src, dst)
+        return size
+
+
+REAL_FS = RealFS()
+
+
+def tree_size(fs: FileSystem, path: str) -> int:
+    """Totale grootte in bytes van een map of bestand, zonder symlinks te volgen"""
+    try:
+        st = fs.lstat(path)
+    except OSError:
+        return 0
+    if not stat.S_ISDIR(st.st_mode):
+        return st.st_size
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            entries = fs.scandir(stack.pop())
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    total += entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                pass
+    return total
+
+
+class _Node:
+    __slots__ = ("mode", "ino", "dev", "size", "target", "mtime_ns", "children")
+
+    def __init__(self, mode: int, ino: int, dev: int, size: int = 0, target: Optional[str] = None):
+        self.mode = mode
+        self.ino = ino
+        self.dev = dev
+        self.size = size
+        self.target = target
+        self.mtime_ns = time.time_ns()
+        self.children: Optional[Dict[str, "_Node"]] = {} if stat.S_ISDIR(mode) else None
+
+    def stat_result(self) -> os.stat_result:
+        # st_mode, st_ino, st_dev, st_nlink, st_uid, st_gid, st_size, st_atime, st_mtime, st_ctime
+        seconds = self.mtime_ns / 1e9
+        return os.stat_result((self.mode, self.ino, self.dev, 1, 0, 0, self.size, seconds, seconds, seconds,
+                               seconds, seconds, seconds, self.mtime_ns, self.mtime_ns, self.mtime_ns))
+
+
+class MemoryEntry:
+    """Tegenhanger van os.DirEntry voor MemoryFS"""
+    __slots__ = ("name", "path", "_node", "_fs")
+
+    def __init__(self, fs: "MemoryFS", path: str, node: _Node):
+        self.name = os.path.basename(path)
+        self.path = path
+        self._node = node
+        self._fs = fs
+
+    def is_symlink(self) -> bool:
+        return stat.S_ISLNK(self._node.mode)
+
+    def is_dir(self, follow_symlinks: bool = True) -> bool:
+        if follow_symlinks and self.is_symlink():
+            try:
+                return stat.S_ISDIR(self._fs.stat(self.path).st_mode)
+            except OSError:
+                return False
+        return stat.S_ISDIR(self._node.mode)
+
+    def is_file(self, follow_symlinks: bool = True) -> bool:
+        if follow_symlinks and self.is_symlink():
+            try:
+                return stat.S_ISREG(self._fs.stat(self.path).st_mode)
+            except OSError:
+                return False
+        return stat.S_ISREG(self._node.mode)
+
+    def inode(self) -> int:
+        return self._node.ino
+
+    def stat(self, follow_symlinks: bool = True) -> os.stat_result:
+        if follow_symlinks:
+            return self._fs.stat(self.path)
+        return self._node.stat_result()
+
+    def __repr__(self):
+        return f"<MemoryEntry {self.name!r}>"
+
+
+class MemoryFS(FileSystem):
+    """Bestandssysteem in het geheugen; bestanden hebben alleen een grootte, geen inhoud.
+
+    Standaard is alles één volume; mount(pad) maakt van een map een apart
+    volume, zodat rename() daarheen EXDEV geeft zoals tussen echte schijven.
+    """
+    MAX_SYMLINKS = 40
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._next_ino = 1
+        self._devices = {"/": 1}
+        self._root = self._new_node(stat.S_IFDIR | 0o755, 1)
+
+    # Opbouw van een boom
+
+    def _new_node(self, mode: int, dev: int, size: int = 0, target: Optional[str] = None) -> _Node:
+        self._next_ino += 1
+        return _Node(mode, self._next_ino, dev, size, target)
+
+    def _device_for(self, path: str) -> int:
+        path = os.path.normpath(path)
+        best = "/"
+        for mount in self._devices:
+            if (path == mount or path.startswith(mount.rstrip("/") + "/")) and len(mount) > len(best):
+                best = mount
+        return self._devices[best]
+
+    def mount(self, path: str):
+        """Maak van `path` (een nieuwe of lege map) een apart volume"""
+        with self._lock:
+            path = os.path.normpath(path)
+            self._devices[path] = len(self._devices) + 1
+            self.makedirs(path)
+
+    def makedirs(self, path: str):
+        with self._lock:
+            node = self._root
+            current = "/"
+            for part in self._parts(path):
+                current = os.path.join(current, part)
+                child = node.children.get(part)
+                if child is None:
+                    child = node.children[part] = self._new_node(stat.S_IFDIR | 0o755, self._device_for(current))
+                    node.mtime_ns = time.time_ns()
+                elif stat.S_ISLNK(child.mode):
+                    child = self._lookup(current, follow=True)
+                if not stat.S_ISDIR(child.mode):
+                    raise NotADirectoryError(errno.ENOTDIR, os.strerror(errno.ENOTDIR), current)
+                node = child
+
+    def write_file(self, path: str, size: int = 0):
+        """Maak (of overschrijf) een bestand van `size` bytes"""
+        with self._lock:
+            parent, name = self._parent(path)
+            parent.children[name] = self._new_node(stat.S_IFREG | 0o644, self._device_for(path), size)
+            parent.mtime_ns = time.time_ns()
+
+    # Padresolutie
+
+    @staticmethod
+    def _parts(path: str) -> List[str]:
+        return [part for part in os.path.normpath(path).split("/") if part]
+
+    def _lookup(self, path: str, follow: bool, depth: int = 0) -> _Node:
+        """Zoek de node voor `path`; symlinks in tussenliggende mappen worden altijd gevolgd"""
+        if depth > self.MAX_SYMLINKS:
+            raise OSError(errno.ELOOP, os.strerror(errno.ELOOP), path)
+        parts = self._parts(path)
+        node = self._root
+        current = "/"
+        for i, part in enumerate(parts):
+            if node.children is None:
+                raise NotADirectoryError(errno.ENOTDIR, os.strerror(errno.ENOTDIR), path)
+            child = node.children.get(part)
+            if child is None:
+                raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), path)
+            is_last = i == len(parts) - 1
+            if stat.S_ISLNK(child.mode) and (follow or not is_last):
+                target = os.path.join(current, child.target)
+                rest = parts[i + 1:]
+                return self._lookup(os.path.join(target, *rest), follow, depth + 1)
+            node = child
+            current = os.path.join(current, part)
+        return node
+
+    def _parent(self, path: str):
+        parent = self._lookup(os.path.dirname(os.path.normpath(path)), follow=True)
+        if parent.children is None:
+            raise NotADirectoryError(errno.ENOTDIR, os.strerror(errno.ENOTDIR), path)
+        return parent, os.path.basename(os.path.normpath(path))
+
+    # FileSystem
+
+    def scandir(self, path):
+        with self._lock:
+            node = self._lookup(path, follow=True)
+            if node.children is None:
+                raise NotADirectoryError(errno.ENOTDIR, os.strerror(errno.ENOTDIR), path)
+            return [MemoryEntry(self, os.path.join(path, name), child) for name, child in node.children.items()]
+
+    def lstat(self, path):
+        with self._lock:
+            return self._lookup(path, follow=False).stat_result()
+
+    def stat(self, path):
+        with self._lock:
+            return self._lookup(path, follow=True).stat_result()
+
+    def readlink(self, path):
+        with self._lock:
+            node = self._lookup(path, follow=False)
+            if not stat.S_ISLNK(node.mode):
+                raise OSError(errno.EINVAL, os.strerror(errno.EINVAL), path)
+            return node.target
+
+    def symlink(self, target, path):
+        with self._lock:
+            parent, name = self._parent(path)
+            if name in parent.children:
+                raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), path)
+            parent.children[name] = self._new_node(stat.S_IFLNK | 0o777, self._device_for(path),
+                                                   len(target), target)
+            parent.mtime_ns = time.time_ns()
+
+    def mkdir(self, path):
+        with self._lock:
+            parent, name = self._parent(path)
+            if name in parent.children:
+                raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), path)
+            parent.children[name] = self._new_node(stat.S_IFDIR | 0o755, self._device_for(path))
+            parent.mtime_ns = time.time_ns()
+
+    def copy_file(self, src, dst):
+        with self._lock:
+            node = self._lookup(src, follow=False)
+            if node.children is not None:
+                raise IsADirectoryError(errno.EISDIR, os.strerror(errno.EISDIR), src)
+            parent, name = self._parent(dst)
+            copy = parent.children[name] = self._new_node(node.mode, self._device_for(dst), node.size, node.target)
+            copy.mtime_ns = node.mtime_ns
+            parent.mtime_ns = time.time_ns()
+
+    def copystat(self, src, dst):
+        with self._lock:
+            self._lookup(dst, follow=False).mtime_ns = self._lookup(src, follow=False).mtime_ns
+
+    def rename(self, src, dst):
+        with self._lock:
+            src_parent, src_name = self._parent(src)
+            node = src_parent.children.get(src_name)
+            if node is None:
+                raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), src)
+            dst_parent, dst_name = self._parent(dst)
+            if self._device_for(os.path.dirname(os.path.normpath(dst))) != node.dev:
+                raise OSError(errno.EXDEV, os.strerror(errno.EXDEV), src, dst)
+            existing = dst_parent.children.get(dst_name)
+            if existing is not None and existing.children:
+                raise OSError(errno.ENOTEMPTY, os.strerror(errno.ENOTEMPTY), dst)
+            del src_parent.children[src_name]
+            dst_parent.children[dst_name] = node
+            src_parent.mtime_ns = dst_parent.mtime_ns = time.time_ns()
+
+    def replace(self, src, dst):
+        self.rename(src, dst)
+
+    def remove(self, path):
+        with self._lock:
+            parent, name = self._parent(path)
+            node = parent.children.get(name)
+            if node is None:
+                raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), path)
+            if node.children is not None:
+                raise IsADirectoryError(errno.EISDIR, os.strerror(errno.EISDIR), path)
+            del parent.children[name]
+            parent.mtime_ns = time.time_ns()
+
+    def rmtree(self, path):
+        with self._lock:
+            parent, name = self._parent(path)
+            node = parent.children.get(name)
+            if node is None:
+                raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), path)
+            if node.children is None:
+                raise NotADirectoryError(errno.ENOTDIR, os.strerror(errno.ENOTDIR), path)
+            del parent.children[name]
+            parent.mtime_ns = time.time_ns()
+
+    def _copy(self, node: _Node, dev: int, on_file: Callable[[int], None]) -> _Node:
+        copy = self._new_node(node.mode, dev, node.size, node.target)
+        copy.mtime_ns = node.mtime_ns
+        if node.children is not None:
+            for name, child in node.children.items():
+                copy.children[name] = self._copy(child, dev, on_file)
+        elif stat.S_ISREG(node.mode):
+            on_file(node.size)
+        return copy
+
+    def move(self, src, dst, workers=COPY_WORKERS, on_copied=None):
+        copied = 0
+
+        def on_file(size):
+            nonlocal copied
+            copied += size
+            if on_copied is not None:
+                on_copied(copied)
+
+        with self._lock:
+            src_parent, src_name = self._parent(src)
+            node = src_parent.children.get(src_name)
+            if node is None:
+                raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), src)
+            dst_parent, dst_name = self._parent(dst)
+            if dst_name in dst_parent.children:
+                raise FileExistsError(errno.EEXIST, "Bestemming bestaat al", dst)
+            dst_parent.children[dst_name] = self._copy(node, self._device_for(dst), on_file)
+            del src_parent.children[src_name]
+            src_parent.mtime_ns = dst_parent.mtime_ns = time.time_ns()
+        return copied
+
+
+class LatencyFS(FileSystem):
+    """Wikkelt een FileSystem en wacht per aanroep `latency` ± `jitter` seconden.
+
+    Met `bytes_per_second` kost move() daarnaast tijd naar rato van het
+    aantal bytes. Met `spinup` wacht de eerste aanroep na `idle` seconden
+    stilte extra lang, zoals een schijf die weer moet opspinnen. Alleen
+    paden onder `paths` (standaard alles) worden vertraagd; bij aanroepen
+    die symlinks volgen (stat, exists, scandir) telt het doel, zodat een
+    symlink in /Applications naar de trage schijf die schijf ook wekt.
+    """
+    MAX_SYMLINKS = 40
+
+    def __init__(self, inner: FileSystem, latency: float = 0.005, jitter: float = 0.0,
+                 bytes_per_second: Optional[float] = None, spinup: float = 0.0, idle: float = 30.0,
+                 paths: Optional[List[str]] = None, seed: Optional[int] = None):
+        self.inner = inner
+        self.native = inner.native
+        self.latency = latency
+        self.jitter = jitter
+        self.bytes_per_second = bytes_per_second
+        self.spinup = spinup
+        self.idle = idle
+        self.paths = [os.path.normpath(path) for path in paths] if paths else None
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._last_call: Optional[float] = None
+
+    def _resolve(self, path: str, depth: int = 0) -> str:
+        """Volg symlinks in alle delen van `path` via het onderliggende FileSystem (zonder vertraging)"""
+        current = "/"
+        for part in self._parts(path):
+            candidate = os.path.join(current, part)
+            try:
+                target = self.inner.readlink(candidate)
+            except OSError:
+                current = candidate
+                continue
+            if depth >= self.MAX_SYMLINKS:
+                return candidate
+            current = self._resolve(os.path.join(current, target), depth + 1)
+        return current
+
+    @staticmethod
+    def _parts(path: str) -> List[str]:
+        return [part for part in os.path.normpath(os.path.abspath(path)).split("/") if part]
+
+    def _slow(self, path: str, follow: bool = False) -> bool:
+        if self.paths is None:
+            return True
+        path = self._resolve(path) if follow else os.path.normpath(path)
+        return any(path == root or path.startswith(root + "/") for root in self.paths)
+
+    def _wait(self, *paths: str, follow: bool = False):
+        if not any(self._slow(path, follow) for path in paths):
+            return
+        now = time.monotonic()
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            if self.spinup and (self._last_call is None or now - self._last_call >= self.idle):
+                delay += self.spinup
+            self._last_call = now
+        # Buiten de lock wachten zodat parallelle aanroepen elkaar niet ophouden
+        time.sleep(delay)
+
+    def scandir(self, path):
+        self._wait(path, follow=True)
+        return self.inner.scandir(path)
+
+    def listdir(self, path):
+        self._wait(path, follow=True)
+        return self.inner.listdir(path)
+
+    def lstat(self, path):
+        self._wait(path)
+        return self.inner.lstat(path)
+
+    def stat(self, path):
+        self._wait(path, follow=True)
+        return self.inner.stat(path)
+
+    def readlink(self, path):
+        self._wait(path)
+        return self.inner.readlink(path)
+
+    def exists(self, path):
+        self._wait(path, follow=True)
+        return self.inner.exists(path)
+
+    def is_real_dir(self, path):
+        self._wait(path)
+        return self.inner.is_real_dir(path)
+
+    def symlink(self, target, path):
+        self._wait(path)
+        self.inner.symlink(target, path)
+
+    def mkdir(self, path):
+        self._wait(path)
+        self.inner.mkdir(path)
+
+    def copy_file(self, src, dst):
+        self._wait(src, dst)
+        self.inner.copy_file(src, dst)
+        if self.bytes_per_second and (self._slow(src) or self._slow(dst)):
+            time.sleep(self.inner.lstat(dst).st_size / self.bytes_per_second)
+
+    def copystat(self, src, dst):
+        self._wait(src, dst)
+        self.inner.copystat(src, dst)
+
+    def rename(self, src, dst):
+        self._wait(src, dst)
+        self.inner.rename(src, dst)
+
+    def replace(self, src, dst):
+        self._wait(src, dst)
+        self.inner.replace(src, dst)
+
+    def remove(self, path):
+        self._wait(path)
+        self.inner.remove(path)
+
+    def rmtree(self, path):
+        self._wait(path)
+        self.inner.rmtree(path)
+
+    def move(self, src, dst, workers=COPY_WORKERS, on_copied=None):
+        self._wait(src, dst)
+        copied = self.inner.move(src, dst, workers, on_copied)
+        if self.bytes_per_second and (self._slow(src) or self._slow(dst)):
+            time.sleep(copied / self.bytes_per_second)
+        return copied
+
+
+class CountingFS(FileSystem):
+    """Wikkelt een FileSystem en meldt elke aanroep met zijn duur aan `on_call(naam, seconden)`"""
+
+    def __init__(self, inner: FileSystem, on_call: Callable[[str, float], None]):
+        self.inner = inner
+        self.native = inner.native
+        self._on_call = on_call
+
+    def _timed(self, name: str, fn, *args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self._on_call(name, time.perf_counter() - start)
+
+    def scandir(self, path):
+        return self._timed("scandir", self.inner.scandir, path)
+
+    def listdir(self, path):
+        return self._timed("listdir", self.inner.listdir, path)
+
+    def lstat(self, path):
+        return self._timed("lstat", self.inner.lstat, path)
+
+    def stat(self, path):
+        return self._timed("stat", self.inner.stat, path)
+
+    def readlink(self, path):
+        return self._timed("readlink", self.inner.readlink, path)
+
+    def exists(self, path):
+        return self._timed("exists", self.inner.exists, path)
+
+    def is_real_dir(self, path):
+        return self._timed("is_real_dir", self.inner.is_real_dir, path)
+
+    def symlink(self, target, path):
+        self._timed("symlink", self.inner.symlink, target, path)
+
+    def mkdir(self, path):
+        self._timed("mkdir", self.inner.mkdir, path)
+
+    def copy_file(self, src, dst):
+        self._timed("copy_file", self.inner.copy_file, src, dst)
+
+    def copystat(self, src, dst):
+        self._timed("copystat", self.inner.copystat, src, dst)
+
+    def rename(self, src, dst):
+        self._timed("rename", self.inner.rename, src, dst)
+
+    def replace(self, src, dst):
+        self._timed("replace", self.inner.replace, src, dst)
+
+    def remove(self, path):
+        self._timed("remove", self.inner.remove, path)
+
+    def rmtree(self, path):
+        self._timed("rmtree", self.inner.rmtree, path)
+
+    def move(self, src, dst, workers=COPY_WORKERS, on_copied=None):
+        return self._timed("move", self.inner.move, src, dst, workers, on_copied)
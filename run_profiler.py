@@ -0,0 +1,114 @@
+"""Profiler voor één check-run (`--profile` of P in de TUI).
+
+Combineert drie metingen rond de scan/herstel-run:
+
+- cProfile van de thread die de run draait, weggeschreven als .pstats
+  (te openen met `python3 -m pstats` of snakeviz)
+- een sampler die elke `interval` seconden de stacks van alle threads
+  opneemt, dus ook van de herstel- en kopieerthreads, als .collapsed
+  bestand (één regel "frame;frame;frame aantal", direct bruikbaar voor
+  flamegraph.pl of speedscope)
+- de piek van het geheugengebruik volgens tracemalloc
+
+Alle drie vertragen de run; gebruik het alleen om een trage run te
+onderzoeken.
+"""
+import cProfile
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Optional
+
+SAMPLE_INTERVAL = 0.005
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+class StackSampler(threading.Thread):
+    """Neemt periodiek de stacks van alle andere threads op"""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.interval = interval
+        self.samples = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        own = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)).replace(";", ":"))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def write(self, path: str):
+        with open(path, 'w', encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class RunProfiler:
+    """Context manager; na afloop staan de paden en de geheugenpiek in de attributen.
+
+        with RunProfiler(directory) as profiler:
+            ...
+        print(profiler.pstats_path, profiler.peak_memory_bytes)
+    """
+
+    def __init__(self, directory: str, prefix: str = "symlink-check", interval: float = SAMPLE_INTERVAL):
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        base = os.path.join(directory, f"{prefix}-{stamp}")
+        self.pstats_path = base + ".pstats"
+        self.collapsed_path = base + ".collapsed"
+        self.peak_memory_bytes = 0
+        self._interval = interval
+        self._profile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[StackSampler] = None
+        self._started_tracemalloc = False
+
+    def __enter__(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        tracemalloc.reset_peak()
+        self._sampler = StackSampler(self._interval)
+        self._sampler.start()
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self._profile.disable()
+        self._sampler.stop()
+        self.peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        self._profile.dump_stats(self.pstats_path)
+        self._sampler.write(self.collapsed_path)
+
+    def as_dict(self) -> dict:
+        return {
+            "pstats": self.pstats_path,
+            "collapsed": self.collapsed_path,
+            "peak_memory_bytes": self.peak_memory_bytes,
+        }
+
+    def summary(self) -> str:
+        return (f"Profiel: {self.pstats_path} en {os.path.basename(self.collapsed_path)}, "
+                f"geheugenpiek {self.peak_memory_bytes / 1_000_000:.1f} MB")
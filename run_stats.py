@@ -0,0 +1,104 @@
+"""Tijden en tellers per fase en per bestandssysteemaanroep van één run.
+
+Wordt een RunStats aan iter_scan() meegegeven, dan houdt de engine per
+fase (list, skiplist, classify, move, rmtree, symlink) het aantal keren en
+de totale tijd bij, en via een CountingFS hetzelfde per aanroep op het
+bestandssysteem (lstat, scandir, rename, ...). Zo is van een trage run te
+zien waar de tijd heen ging zonder profiler.
+
+Herstelacties lopen parallel, dus de tijden per fase zijn opgeteld over
+threads en kunnen samen meer zijn dan de totale looptijd.
+
+Niet als aanroep geteld (wel in de tijd van hun fase): het parallel
+kopiëren binnen move_bundle (telt als één move), het lezen van bestanden
+voor de sha256 van delta-sync, de stat van scandir-entries en het
+verwijderen door de TrashReaper, dat na de run op de achtergrond
+doorloopt. Het verplaatsen naar de prullenbak telt wel, als rename.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+PHASES = ("list", "skiplist", "classify", "move", "rmtree", "symlink")
+# Aantal aanroepen (de traagste) in summary_lines()
+SUMMARY_SYSCALLS = 6
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds < 1:
+        return f"{seconds * 1000:.0f} ms"
+    return f"{seconds:.1f} s"
+
+
+class RunStats:
+    """Mag vanuit meerdere threads tegelijk bijgewerkt worden"""
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        # naam -> [aantal, seconden]
+        self.phases: Dict[str, list] = {}
+        self.syscalls: Dict[str, list] = {}
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        self.started = self.clock()
+        self.finished = None
+
+    def stop(self):
+        self.finished = self.clock()
+
+    @property
+    def wall_seconds(self) -> float:
+        if self.started is None:
+            return 0.0
+        end = self.finished if self.finished is not None else self.clock()
+        return end - self.started
+
+    def add(self, phase: str, seconds: float, count: int = 1):
+        with self._lock:
+            entry = self.phases.setdefault(phase, [0, 0.0])
+            entry[0] += count
+            entry[1] += seconds
+
+    def syscall(self, name: str, seconds: float):
+        with self._lock:
+            entry = self.syscalls.setdefault(name, [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+    @contextmanager
+    def phase(self, name: str):
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.add(name, self.clock() - start)
+
+    def _ordered_phases(self) -> List[str]:
+        return [name for name in PHASES if name in self.phases] + sorted(set(self.phases) - set(PHASES))
+
+    def as_dict(self) -> dict:
+        """Voor de JSON-uitvoer; tijden in seconden"""
+        with self._lock:
+            return {
+                "wall_seconds": round(self.wall_seconds, 6),
+                "phases": {name: {"count": self.phases[name][0], "seconds": round(self.phases[name][1], 6)}
+                           for name in self._ordered_phases()},
+                "syscalls": {name: {"count": count, "seconds": round(seconds, 6)}
+                             for name, (count, seconds) in sorted(self.syscalls.items())},
+            }
+
+    def summary_lines(self) -> List[str]:
+        """Twee regels voor de TUI: fasen en de aanroepen die de meeste tijd kostten"""
+        with self._lock:
+            phases = " | ".join(f"{name} {_format_seconds(self.phases[name][1])} ({self.phases[name][0]}×)"
+                                for name in self._ordered_phases())
+            calls = sorted(self.syscalls.items(), key=lambda item: item[1][1], reverse=True)[:SUMMARY_SYSCALLS]
+            syscalls = " | ".join(f"{name} {count}× {_format_seconds(seconds)}" for name, (count, seconds) in calls)
+        return [
+            f"Looptijd: {_format_seconds(self.wall_seconds)} | {phases or 'geen fasen'}",
+            f"Aanroepen: {syscalls or 'geen'}",
+        ]
@@ -0,0 +1,71 @@
+"""Skiplist met exacte namen, glob-patronen en reguliere expressies.
+
+Een regel in skiplist.txt is één van:
+
+    Foo.app          exacte naam
+    Adobe*.app       glob-patroon (*, ? en [...])
+    re:^Microsoft .* exacte match op een reguliere expressie
+
+Alle patronen worden één keer samen in een regex gecompileerd; exacte
+namen gaan via een set, zodat een lookup per item vrijwel constant is.
+Een glob-regel matcht ook zijn eigen naam letterlijk, zodat een bestaande
+regel als `Foo [Beta].app` blijft werken.
+Een ongeldige regex geeft een ValueError, of wordt met `strict=False`
+overgeslagen en in `invalid` gemeld (voor een met de hand bewerkt bestand).
+"""
+import fnmatch
+import re
+from typing import Iterable, Iterator, List, Optional, Pattern
+
+REGEX_PREFIX = "re:"
+_GLOB_CHARS = frozenset("*?[")
+
+
+class Skiplist:
+    """Gecompileerde skiplist; `item in skiplist` werkt als bij een set"""
+    __slots__ = ("entries", "names", "pattern", "invalid")
+
+    def __init__(self, entries: Iterable[str] = (), strict: bool = True):
+        self.entries = frozenset(entries)
+        # Meldingen voor overgeslagen regels (alleen met strict=False)
+        self.invalid: List[str] = []
+        names = set()
+        patterns = []
+        for entry in sorted(self.entries):
+            if entry.startswith(REGEX_PREFIX):
+                regex = entry[len(REGEX_PREFIX):]
+                try:
+                    re.compile(regex)
+                except re.error as e:
+                    message = f"Ongeldige regex in skiplist: {entry} ({e})"
+                    if strict:
+                        raise ValueError(message) from None
+                    self.invalid.append(message)
+                    continue
+                patterns.append(regex)
+            else:
+                names.add(entry)
+                if _GLOB_CHARS.intersection(entry):
+                    patterns.append(fnmatch.translate(entry))
+        self.names = frozenset(names)
+        self.pattern: Optional[Pattern[str]] = (
+            re.compile("|".join(f"(?:{p})" for p in patterns)) if patterns else None
+        )
+
+    def __contains__(self, name: str) -> bool:
+        if name in self.names:
+            return True
+        return self.pattern is not None and self.pattern.fullmatch(name) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+def compile_skiplist(entries: Iterable[str]) -> Skiplist:
+    """Compileer de regels, tenzij `entries` al een Skiplist is"""
+    if isinstance(entries, Skiplist):
+        return entries
+    return Skiplist(entries)
@@ -0,0 +1,157 @@
+"""Niet-interactieve command line voor Symlink Checker.
+
+Draait de scan/herstel-engine zonder Textual en schrijft per bundle één
+JSON-object per regel (NDJSON) naar stdout, gevolgd door een samenvatting
+met tijden per fase en tellers per bestandssysteemaanroep.
+Geschikt voor cron/systemd en log shippers:
+
+    sudo python3 symlink_cli.py --headless
+"""
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from contextlib import nullcontext
+
+from symlink_config import compiled_skiplist, load_config, profile_dir, scan_options, repair_options
+from run_stats import RunStats
+from symlink_engine import REPAIR_STATUSES, CheckResult, ResultStatus, iter_scan
+from trash_reaper import TrashReaper
+
+EXIT_OK = 0
+# Er zijn nog apps die aandacht nodig hebben (ontbrekend, dode of verkeerde symlink)
+EXIT_ISSUES = 1
+# Argparse gebruikt 2 voor ongeldige argumenten
+EXIT_ERRORS = 3
+
+ISSUE_STATUSES = (ResultStatus.MISSING, ResultStatus.NOT_SYMLINK, ResultStatus.DANGLING, ResultStatus.WRONG_TARGET)
+
+
+def result_record(result: CheckResult) -> dict:
+    record = {"item": result.item, "status": result.status.value, "bericht": result.bericht}
+    if result.methode is not None:
+        record["methode"] = result.methode
+    if result.status in REPAIR_STATUSES:
+        record["bytes_moved"] = result.bytes_moved
+        record["duration"] = round(result.duration, 3)
+    return record
+
+
+def emit(record: dict, out=sys.stdout):
+    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    out.flush()
+
+
+def exit_code(counts: Counter) -> int:
+    if counts[ResultStatus.ERROR]:
+        return EXIT_ERRORS
+    # Een NOT_SYMLINK die hersteld is telt niet meer als probleem
+    open_issues = sum(counts[status] for status in ISSUE_STATUSES) - counts[ResultStatus.FIXED]
+    return EXIT_ISSUES if open_issues > 0 else EXIT_OK
+
+
+def load_skiplist():
+    """De gecompileerde skiplist; ongeldige regels worden gemeld op stderr"""
+    skiplist = compiled_skiplist()
+    for message in skiplist.invalid:
+        print(f"⚠️ {message} (regel overgeslagen)", file=sys.stderr)
+    return skiplist
+
+
+def run_headless(config, repair: bool = True, out=sys.stdout) -> int:
+    """Scan (en herstel) alles en stream de resultaten als NDJSON"""
+    trash_reaper = TrashReaper() if config.get("deferred_delete", True) else None
+    if trash_reaper is not None:
+        trash_reaper.sweep(config["symlinked_dir"])
+        trash_reaper.sweep(config["apps_dir"])
+    kwargs = scan_options(config, trash_reaper)
+    snapshot = kwargs["snapshot"]
+    counts = Counter()
+    stats = RunStats()
+    profiler = None
+    if config.get("profile", False):
+        from run_profiler import RunProfiler
+        profiler = RunProfiler(profile_dir(config))
+    with profiler if profiler is not None else nullcontext():
+        for result in iter_scan(config["symlinked_dir"], config["apps_dir"], load_skiplist(), repair=repair,
+                                stats=stats, **kwargs):
+            counts[result.status] += 1
+            emit(result_record(result), out)
+    summary = {
+        "summary": {status.value: counts[status] for status in ResultStatus},
+        "total": sum(n for status, n in counts.items() if status not in (ResultStatus.FIXED, ResultStatus.ERROR)),
+    }
+    if snapshot is not None:
+        summary["unchanged"] = snapshot.unchanged
+    summary["stats"] = stats.as_dict()
+    if profiler is not None:
+        summary["profile"] = profiler.as_dict()
+    code = exit_code(counts)
+    summary["exit_code"] = code
+    emit(summary, out)
+    if trash_reaper is not None:
+        trash_reaper.wait()
+    return code
+
+
+def run_watch(config, repair: bool = True, out=sys.stdout) -> int:
+    """Volg wijzigingen en stream elk resultaat als NDJSON tot Ctrl+C"""
+    from symlink_watch import SETTLE_SECONDS, iter_watch
+    trash_reaper = TrashReaper() if config.get("deferred_delete", True) else None
+    if trash_reaper is not None:
+        trash_reaper.sweep(config["symlinked_dir"])
+        trash_reaper.sweep(config["apps_dir"])
+    try:
+        for result in iter_watch(config["symlinked_dir"], config["apps_dir"], load_skiplist(), repair=repair,
+                                 settle=config.get("watch_settle_seconds", SETTLE_SECONDS),
+                                 verify_target=config.get("verify_targets", False),
+                                 options=repair_options(config, trash_reaper)):
+            emit(result_record(result), out)
+    except KeyboardInterrupt:
+        pass
+    return EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Controleer en herstel symlinks van apps.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--headless", action="store_true", help="eenmalige scan zonder TUI, NDJSON naar stdout")
+    mode.add_argument("--watch", action="store_true", help="blijf wijzigingen volgen en herstel direct")
+    parser.add_argument("--no-repair", action="store_true", help="alleen controleren, niets verplaatsen")
+    parser.add_argument("--full", action="store_true", help="negeer de opgeslagen scan en controleer alles")
+    parser.add_argument("--profile", action="store_true",
+                        help="profileer de run (cProfile, stack-samples en geheugenpiek) naast het activiteitenlog")
+    parser.add_argument("--symlinked-dir", help="overschrijf symlinked_dir uit config.json")
+    parser.add_argument("--apps-dir", help="overschrijf apps_dir uit config.json")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    config = load_config()
+    if args.symlinked_dir:
+        config["symlinked_dir"] = args.symlinked_dir
+    if args.apps_dir:
+        config["apps_dir"] = args.apps_dir
+    if args.full:
+        config["incremental"] = False
+    if args.profile:
+        config["profile"] = True
+    repair = not args.no_repair
+
+    for key in ("symlinked_dir", "apps_dir"):
+        if not os.path.isdir(config[key]):
+            print(f"❌ {key} bestaat niet: {config[key]}", file=sys.stderr)
+            return EXIT_ERRORS
+    if repair and os.geteuid() != 0:
+        print("❌ Herstellen vereist root rechten (of gebruik --no-repair).", file=sys.stderr)
+        return EXIT_ERRORS
+
+    if args.watch:
+        return run_watch(config, repair)
+    return run_headless(config, repair)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
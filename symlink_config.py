@@ -0,0 +1,221 @@
+"""Configuratie en skiplist van Symlink Checker (zonder Textual).
+
+`config.json` en `skiplist.txt` worden één keer gelezen en in het geheugen
+gehouden tot hun mtime of grootte verandert. Wijzigingen worden kort
+verzameld en dan in één keer atomair weggeschreven (tijdelijk bestand +
+rename); bij het afsluiten wordt alles wat nog openstaat weggeschreven.
+"""
+import atexit
+import os
+import json
+import threading
+from typing import Callable, Dict, Optional
+
+from skiplist_matcher import Skiplist
+from symlink_engine import RepairOptions, ScanSnapshot
+
+
+CONFIG_FILE = os.path.join(os.path.dirname(__file__), "config.json")
+SKIPLIST_FILE = os.path.join(os.path.dirname(__file__), "skiplist.txt")
+STATE_FILE = os.path.join(os.path.dirname(__file__), "scan_state.json")
+# Aantal parallelle herstelacties en maximaal aantal MB dat tegelijk verplaatst wordt
+# (0 = geen budget; het meten kost een extra doorloop van elke bundle)
+REPAIR_WORKERS = 4
+REPAIR_MAX_INFLIGHT_MB = 0
+# Wijzigingen binnen dit aantal seconden worden samen weggeschreven
+WRITE_DEBOUNCE = 0.5
+
+DEFAULT_CONFIG = {
+    "symlinked_dir": "/Volumes/MMKMINI/SYMLINKED",
+    "apps_dir": "/Applications"
+}
+
+
+def write_atomic(path: str, text: str):
+    """Schrijf `text` via een tijdelijk bestand en rename, zodat lezers nooit een half bestand zien"""
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+class CachedFile:
+    """Geparste inhoud van één bestand met uitgestelde, atomaire write-back.
+
+    get() leest het bestand alleen opnieuw als mtime of grootte veranderd
+    is en geeft None als het niet bestaat. set() vervangt de waarde direct
+    in het geheugen; het schrijven gebeurt `debounce` seconden later, zodat
+    meerdere wijzigingen samen één write worden. Waarden worden niet
+    in-place aangepast: set() krijgt altijd een nieuw object.
+    """
+
+    def __init__(self, path: str, parse: Callable, dump: Callable, debounce: float = WRITE_DEBOUNCE):
+        self.path = path
+        self._parse = parse
+        self._dump = dump
+        self.debounce = debounce
+        self._value = None
+        self._key = None
+        self._dirty = False
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+
+    def _stat_key(self) -> Optional[tuple]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def get(self):
+        with self._lock:
+            if self._dirty:
+                return self._value
+            key = self._stat_key()
+            if key != self._key:
+                self._value = self._parse(self.path) if key is not None else None
+                self._key = key
+            return self._value
+
+    def set(self, value):
+        with self._lock:
+            self._value = value
+            self._dirty = True
+            if self._timer is None:
+                self._timer = threading.Timer(self.debounce, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def update(self, change: Callable):
+        """Vervang de waarde door `change(huidige waarde)`, als één stap"""
+        with self._lock:
+            self.set(change(self.get()))
+
+    def flush(self):
+        """Schrijf openstaande wijzigingen direct weg"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            write_atomic(self.path, self._dump(self._value))
+            self._dirty = False
+            self._key = self._stat_key()
+
+
+def _read_json(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _dump_json(data) -> str:
+    return json.dumps(data, indent=2)
+
+
+def _read_skiplist(path):
+    with open(path, 'r') as f:
+        return frozenset(line.strip() for line in f if line.strip())
+
+
+def _dump_skiplist(entries) -> str:
+    return '\n'.join(sorted(entries)) + '\n'
+
+
+_caches: Dict[str, CachedFile] = {}
+_caches_lock = threading.Lock()
+
+
+def _cached(path: str, parse: Callable, dump: Callable) -> CachedFile:
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = _caches[path] = CachedFile(path, parse, dump)
+        return cache
+
+
+@atexit.register
+def flush_all():
+    """Schrijf alle uitgestelde wijzigingen weg"""
+    for cache in list(_caches.values()):
+        cache.flush()
+
+
+def load_config():
+    cache = _cached(CONFIG_FILE, _read_json, _dump_json)
+    config = cache.get()
+    if config is None:
+        config = dict(DEFAULT_CONFIG)
+        cache.set(config)
+        cache.flush()
+    # Kopie: aanpassingen gaan via save_config() of update_config()
+    return dict(config)
+
+
+def save_config(config):
+    _cached(CONFIG_FILE, _read_json, _dump_json).set(dict(config))
+
+
+def update_config(**changes):
+    """Pas een paar sleutels aan zonder de hele configuratie door te geven"""
+    _cached(CONFIG_FILE, _read_json, _dump_json).update(lambda config: {**(config or DEFAULT_CONFIG), **changes})
+
+
+def _skiplist_cache() -> CachedFile:
+    return _cached(SKIPLIST_FILE, _read_skiplist, _dump_skiplist)
+
+
+def lees_skiplist():
+    return set(_skiplist_cache().get() or ())
+
+
+_compiled = (None, Skiplist())
+
+
+def compiled_skiplist() -> Skiplist:
+    """De skiplist als gecompileerde matcher; alleen opnieuw gecompileerd als hij veranderd is.
+
+    Ongeldige regels worden overgeslagen en staan in `.invalid`, zodat een
+    tikfout in skiplist.txt een check niet laat crashen.
+    """
+    global _compiled
+    entries = _skiplist_cache().get()
+    if _compiled[0] is not entries:
+        _compiled = (entries, Skiplist(entries or (), strict=False))
+    return _compiled[1]
+
+
+def voeg_toe_aan_skiplist(app_naam):
+    _skiplist_cache().update(lambda entries: frozenset(entries or ()) | {app_naam})
+
+
+def verwijder_uit_skiplist(app_naam):
+    _skiplist_cache().update(lambda entries: frozenset(entries or ()) - {app_naam})
+
+
+def repair_options(config, trash_reaper=None):
+    """Bouw de RepairOptions voor de engine uit de configuratie"""
+    return RepairOptions(
+        delta_sync=config.get("delta_sync", False),
+        delta_hash=config.get("delta_hash", False),
+        mtime_window=config.get("delta_mtime_window", 0.0),
+        copy_workers=config.get("copy_workers", 0),
+        trash=trash_reaper,
+    )
+
+
+def profile_dir(config):
+    """Map voor profielbestanden: naast het activiteitenlog, anders naast config.json"""
+    log_file = config.get("activity_log_file")
+    return os.path.dirname(os.path.abspath(log_file)) if log_file else os.path.dirname(os.path.abspath(CONFIG_FILE))
+
+
+def scan_options(config, trash_reaper=None):
+    """Keyword-argumenten voor iter_scan() volgens de configuratie"""
+    return {
+        "verify_target": config.get("verify_targets", False),
+        "repair_workers": config.get("repair_workers", REPAIR_WORKERS),
+        "max_inflight_bytes": config.get("repair_max_inflight_mb", REPAIR_MAX_INFLIGHT_MB) * 1_000_000 or None,
+        "options": repair_options(config, trash_reaper),
+        "snapshot": ScanSnapshot(STATE_FILE) if config.get("incremental", True) else None,
+    }
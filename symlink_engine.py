@@ -0,0 +1,904 @@
+"""Scan- en herstel-engine voor Symlink Checker.
+
+Deze module bevat alle bestandssysteemlogica en importeert geen Textual,
+zodat de TUI, een CLI en benchmarks hetzelfde pad kunnen gebruiken. Scannen
+en herstellen lopen via een FileSystem (zie filesystem.py); standaard is dat
+het echte bestandssysteem.
+"""
+import errno
+import hashlib
+import json
+import os
+import queue
+import stat
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from contextlib import nullcontext
+from dataclasses import dataclass
+from enum import Enum
+from typing import AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from filesystem import REAL_FS, CountingFS, FileSystem, tree_size
+from run_stats import RunStats
+from skiplist_matcher import Skiplist, compile_skiplist
+from trash_reaper import TrashReaper
+
+
+class ResultStatus(str, Enum):
+    VALID = "valid"
+    SKIPPED = "skipped"
+    MISSING = "missing"
+    NOT_SYMLINK = "not_symlink"
+    DANGLING = "dangling"
+    WRONG_TARGET = "wrong_target"
+    FIXED = "fixed"
+    ERROR = "error"
+
+
+class BundleStatus(str, Enum):
+    """Toestand van een item in de apps map, bepaald door classify()"""
+    MISSING = "missing"
+    VALID_SYMLINK = "valid_symlink"
+    DANGLING_SYMLINK = "dangling_symlink"
+    WRONG_TARGET = "wrong_target"
+    REAL_DIRECTORY = "real_directory"
+    OTHER = "other"
+
+
+# Statussen die het resultaat van een herstelpoging zijn (na NOT_SYMLINK)
+REPAIR_STATUSES = (ResultStatus.FIXED, ResultStatus.ERROR)
+
+
+class CheckResult:
+    """Resultaat voor één item; met __slots__ zodat grote scans weinig geheugen kosten.
+
+    `bericht` is de volledige melding voor het log; tabellen en de CLI
+    lezen de losse velden. `bytes_moved` en `duration` (seconden) worden
+    alleen door een herstelpoging ingevuld.
+    """
+    __slots__ = ("item", "status", "bericht", "methode", "bytes_moved", "duration")
+
+    def __init__(self, item: str, status: ResultStatus, bericht: str, methode: Optional[str] = None,
+                 bytes_moved: int = 0, duration: float = 0.0):
+        self.item = item
+        self.status = status
+        self.bericht = bericht
+        # Hoe een herstelde bundle verplaatst is: MOVE_RENAME, MOVE_COPY of MOVE_DELTA
+        self.methode = methode
+        self.bytes_moved = bytes_moved
+        self.duration = duration
+
+    def _fields(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        if not isinstance(other, CheckResult):
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"CheckResult({fields})"
+
+
+MOVE_RENAME = "rename"
+MOVE_COPY = "copy"
+MOVE_DELTA = "delta"
+
+
+@dataclass
+class RepairOptions:
+    # Werk een bestaande kopie in SYMLINKED bij in plaats van hem opnieuw te kopiëren
+    delta_sync: bool = False
+    # Vergelijk bestanden bij delta-sync op inhoud (sha256) in plaats van grootte/mtime
+    delta_hash: bool = False
+    # Toegestaan verschil in mtime (seconden) bij delta-sync; 0 vergelijkt exact, zoals
+    # rsync zonder --modify-window. FAT/exFAT slaat tijden per 2 seconden op.
+    mtime_window: float = 0.0
+    # Threads voor het kopiëren van bestanden binnen één bundle; 0 gebruikt shutil.move
+    copy_workers: int = 0
+    # Oude kopieën naar de prullenbak verplaatsen en op de achtergrond verwijderen
+    trash: Optional[TrashReaper] = None
+
+
+@dataclass
+class SyncStats:
+    files_copied: int = 0
+    bytes_copied: int = 0
+    removed: int = 0
+
+
+def _phase(stats: Optional[RunStats], name: str):
+    return stats.phase(name) if stats is not None else nullcontext()
+
+
+StepCallback = Callable[[str, str], None]
+# on_progress(item, gekopieerde_bytes, verstreken_seconden)
+ProgressCallback = Callable[[str, int, float], None]
+
+
+class ThrottledReporter:
+    """Verzamelt status-, voortgangs- en logupdates en geeft ze maximaal
+    `max_fps` keer per seconde door aan `flush_cb`. Mag vanuit meerdere
+    threads tegelijk gebruikt worden.
+
+    `flush_cb(status, details, advance, logs, results)` krijgt alleen de
+    laatste status/details tekst (of None als die niet veranderd is), het
+    aantal opgespaarde voortgangsstappen, de logregels en de via result()
+    gemelde resultaten sinds de vorige flush.
+
+    Met `max_logs` worden tussen twee flushes alleen de laatste `max_logs`
+    regels bewaard (ringbuffer); met `spill` wordt elke regel ook direct
+    naar dat bestand geschreven, zodat het volledige log bewaard blijft.
+    """
+
+    def __init__(self, flush_cb, max_fps: float = 20, clock=time.monotonic,
+                 max_logs: Optional[int] = None, spill: Optional[TextIO] = None):
+        self._flush_cb = flush_cb
+        self._interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self._clock = clock
+        self._last_flush = None
+        self._status = None
+        self._details = None
+        self._advance = 0
+        self._logs = deque(maxlen=max_logs)
+        self._results = []
+        self._spill = spill
+        self._lock = threading.Lock()
+
+    def status(self, text: str):
+        with self._lock:
+            self._status = text
+
+    def details(self, text: str):
+        with self._lock:
+            self._details = text
+
+    def advance(self, amount: int = 1):
+        with self._lock:
+            self._advance += amount
+
+    def log(self, msg: str):
+        with self._lock:
+            self._logs.append(msg)
+            self._details = msg
+            if self._spill is not None:
+                self._spill.write(msg + "\n")
+
+    def result(self, result: CheckResult):
+        with self._lock:
+            self._results.append(result)
+
+    @property
+    def dirty(self) -> bool:
+        return (self._status is not None or self._details is not None or self._advance > 0
+                or bool(self._logs) or bool(self._results))
+
+    def maybe_flush(self) -> bool:
+        """Flush als het interval verstreken is; geeft True terug als er geflusht is"""
+        now = self._clock()
+        with self._lock:
+            if self._last_flush is not None and now - self._last_flush < self._interval:
+                return False
+        return self.flush(now)
+
+    def flush(self, now: Optional[float] = None) -> bool:
+        """Geef alle opgespaarde updates direct door"""
+        with self._lock:
+            self._last_flush = self._clock() if now is None else now
+            if not self.dirty:
+                return False
+            status, details, advance, logs = self._status, self._details, self._advance, list(self._logs)
+            results = self._results
+            self._status = None
+            self._details = None
+            self._advance = 0
+            self._logs.clear()
+            self._results = []
+        self._flush_cb(status, details, advance, logs, results)
+        return True
+
+
+def is_app_name(name: str) -> bool:
+    return name.endswith('.app') and not name.startswith('.')
+
+
+def list_items(symlinked_dir: str, fs: FileSystem = REAL_FS) -> List[str]:
+    """Geef alle zichtbare .app items in de SYMLINKED map"""
+    return [item for item in fs.listdir(symlinked_dir) if is_app_name(item)]
+
+
+def index_dir(path: str, fs: FileSystem = REAL_FS) -> Dict[str, os.DirEntry]:
+    """Lees een map in één scandir-pass en indexeer de .app entries op naam"""
+    return {entry.name: entry for entry in fs.scandir(path) if is_app_name(entry.name)}
+
+
+def _link_target(path: str, fs: FileSystem = REAL_FS) -> str:
+    """Geef het genormaliseerde, absolute doel van een symlink"""
+    target = fs.readlink(path)
+    return os.path.normpath(os.path.join(os.path.dirname(path), target))
+
+
+def classify(path: str, expected_target: Optional[str] = None, verify_target: bool = False,
+             fs: FileSystem = REAL_FS) -> BundleStatus:
+    """Classificeer een pad met één lstat-aanroep.
+
+    Bij een symlink wordt het doel alleen vergeleken met `expected_target`
+    (readlink, lokaal) en alleen bij `verify_target` daadwerkelijk
+    opgevraagd, omdat dat het externe volume aanspreekt.
+    """
+    try:
+        st = fs.lstat(path)
+    except FileNotFoundError:
+        return BundleStatus.MISSING
+    if stat.S_ISLNK(st.st_mode):
+        return _classify_link(path, expected_target, verify_target, fs)
+    if stat.S_ISDIR(st.st_mode):
+        return BundleStatus.REAL_DIRECTORY
+    return BundleStatus.OTHER
+
+
+def classify_entry(entry: Optional[os.DirEntry], expected_target: Optional[str] = None,
+                   verify_target: bool = False, fs: FileSystem = REAL_FS) -> BundleStatus:
+    """Classificeer een scandir entry op basis van de gecachte type-informatie.
+
+    `entry` is None als de naam niet in de map voorkomt.
+    """
+    if entry is None:
+        return BundleStatus.MISSING
+    if entry.is_symlink():
+        return _classify_link(entry.path, expected_target, verify_target, fs)
+    if entry.is_dir(follow_symlinks=False):
+        return BundleStatus.REAL_DIRECTORY
+    return BundleStatus.OTHER
+
+
+def _classify_link(path: str, expected_target: Optional[str], verify_target: bool,
+                   fs: FileSystem) -> BundleStatus:
+    if expected_target is not None and _link_target(path, fs) != os.path.normpath(expected_target):
+        return BundleStatus.WRONG_TARGET
+    if verify_target and not fs.exists(path):
+        return BundleStatus.DANGLING_SYMLINK
+    return BundleStatus.VALID_SYMLINK
+
+
+def check_item(item: str, symlinked_dir: str, apps_dir: str, skiplist: Iterable[str] = (),
+               verify_target: bool = False, index: Optional[Dict[str, os.DirEntry]] = None,
+               fs: FileSystem = REAL_FS, stats: Optional[RunStats] = None) -> CheckResult:
+    """Bepaal de status van één app zonder iets te wijzigen.
+
+    Met een `index` uit index_dir(apps_dir) wordt geen extra syscall per
+    item gedaan; anders wordt het pad met één lstat geclassificeerd.
+    """
+    if stats is not None:
+        start = stats.clock()
+        skipped = item in skiplist
+        stats.add("skiplist", stats.clock() - start)
+    else:
+        skipped = item in skiplist
+    if skipped:
+        return CheckResult(item, ResultStatus.SKIPPED, f"[SKIP] {item} staat in de skiplist, wordt overgeslagen.")
+
+    with _phase(stats, "classify"):
+        app_path = os.path.join(apps_dir, item)
+        expected = os.path.join(symlinked_dir, item)
+        if index is not None:
+            status = classify_entry(index.get(item), expected, verify_target, fs)
+        else:
+            status = classify(app_path, expected, verify_target, fs)
+        return _result_for(item, status, app_path, expected, apps_dir, fs)
+
+
+def _result_for(item: str, status: BundleStatus, app_path: str, expected: str, apps_dir: str,
+                fs: FileSystem) -> CheckResult:
+    if status == BundleStatus.MISSING:
+        return CheckResult(item, ResultStatus.MISSING, f"[!] {item} bestaat niet in {apps_dir}")
+    if status == BundleStatus.VALID_SYMLINK:
+        return CheckResult(item, ResultStatus.VALID, f"✓ {item} is een geldige symlink")
+    if status == BundleStatus.DANGLING_SYMLINK:
+        return CheckResult(item, ResultStatus.DANGLING, f"[!] {item} bestaat niet meer op {expected} (dode symlink)")
+    if status == BundleStatus.WRONG_TARGET:
+        return CheckResult(item, ResultStatus.WRONG_TARGET,
+                           f"[!] {item} is GEEN symlink naar {expected} maar naar {_link_target(app_path, fs)}")
+    return CheckResult(item, ResultStatus.NOT_SYMLINK, f"[!] {item} is GEEN symlink meer in {apps_dir}")
+
+
+def _move(src: str, dst: str, item: str, on_progress: Optional[ProgressCallback], options: RepairOptions,
+          fs: FileSystem) -> int:
+    """Verplaats een bundle naar een ander volume, meld de voortgang per bestand en geef het aantal bytes"""
+    start = time.monotonic()
+    on_copied = None
+    if on_progress is not None:
+        def on_copied(copied):
+            on_progress(item, copied, time.monotonic() - start)
+    return fs.move(src, dst, options.copy_workers, on_copied)
+
+
+def entry_kind(entry: os.DirEntry) -> str:
+    if entry.is_symlink():
+        return "link"
+    if entry.is_dir(follow_symlinks=False):
+        return "dir"
+    return "file"
+
+
+def _file_digest(path: str) -> bytes:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(chunk)
+    return h.digest()
+
+
+def _same_file(src: os.DirEntry, dst: os.DirEntry, use_hash: bool, mtime_window: float) -> bool:
+    src_st = src.stat(follow_symlinks=False)
+    dst_st = dst.stat(follow_symlinks=False)
+    if src_st.st_size != dst_st.st_size:
+        return False
+    if use_hash:
+        return _file_digest(src.path) == _file_digest(dst.path)
+    if mtime_window <= 0:
+        return src_st.st_mtime_ns == dst_st.st_mtime_ns
+    return abs(src_st.st_mtime_ns - dst_st.st_mtime_ns) <= mtime_window * 1e9
+
+
+def _remove_path(path: str, fs: FileSystem):
+    if fs.is_real_dir(path):
+        fs.rmtree(path)
+    else:
+        fs.remove(path)
+
+
+def sync_tree(src: str, dst: str, use_hash: bool = False,
+              on_copied: Optional[Callable[[int], None]] = None, fs: FileSystem = REAL_FS,
+              mtime_window: float = 0.0) -> SyncStats:
+    """Maak `dst` gelijk aan `src` door alleen gewijzigde bestanden te kopiëren.
+
+    Bestanden worden als gelijk beschouwd bij dezelfde grootte en mtime
+    (of dezelfde sha256 met `use_hash`); met `mtime_window` mogen de mtimes
+    zoveel seconden verschillen (2 voor FAT/exFAT). Wat niet in `src` voorkomt wordt uit
+    `dst` verwijderd. `on_copied` krijgt het totaal aantal gekopieerde bytes.
+    Alle wijzigingen gaan via `fs`; alleen het lezen van de inhoud voor de
+    sha256 en de stat van scandir-entries gaan er buiten om.
+    """
+    stats = SyncStats()
+    _sync_dir(src, dst, use_hash, mtime_window, stats, on_copied, fs)
+    return stats
+
+
+def _sync_dir(src: str, dst: str, use_hash: bool, mtime_window: float, stats: SyncStats, on_copied,
+              fs: FileSystem):
+    src_entries = {entry.name: entry for entry in fs.scandir(src)}
+    dst_entries = {entry.name: entry for entry in fs.scandir(dst)}
+
+    for name, dst_entry in list(dst_entries.items()):
+        src_entry = src_entries.get(name)
+        if src_entry is None or entry_kind(src_entry) != entry_kind(dst_entry):
+            _remove_path(dst_entry.path, fs)
+            del dst_entries[name]
+            stats.removed += 1
+
+    for name, src_entry in src_entries.items():
+        dst_entry = dst_entries.get(name)
+        target = os.path.join(dst, name)
+        kind = entry_kind(src_entry)
+        if kind == "dir":
+            if dst_entry is None:
+                fs.mkdir(target)
+            _sync_dir(src_entry.path, target, use_hash, mtime_window, stats, on_copied, fs)
+        elif kind == "link":
+            link = fs.readlink(src_entry.path)
+            if dst_entry is None or fs.readlink(dst_entry.path) != link:
+                if dst_entry is not None:
+                    fs.remove(target)
+                fs.symlink(link, target)
+        elif dst_entry is None or not _same_file(src_entry, dst_entry, use_hash, mtime_window):
+            if dst_entry is not None:
+                fs.remove(target)
+            fs.copy_file(src_entry.path, target)
+            stats.files_copied += 1
+            stats.bytes_copied += src_entry.stat(follow_symlinks=False).st_size
+            if on_copied is not None:
+                on_copied(stats.bytes_copied)
+    fs.copystat(src, dst)
+
+
+def same_device(path: str, directory: str, fs: FileSystem = REAL_FS) -> bool:
+    """True als `path` (zelf, niet het symlink-doel) op hetzelfde volume staat als `directory`"""
+    try:
+        return fs.lstat(path).st_dev == fs.stat(directory).st_dev
+    except OSError:
+        return False
+
+
+def _replace_with_symlink(target: str, link_path: str, fs: FileSystem = REAL_FS):
+    """Maak `link_path` atomair een symlink naar `target` via een tijdelijke link"""
+    tmp_path = f"{link_path}.symlink-{os.getpid()}-{threading.get_ident()}"
+    fs.symlink(target, tmp_path)
+    try:
+        fs.replace(tmp_path, link_path)
+    except BaseException:
+        fs.remove(tmp_path)
+        raise
+
+
+def _move_to_trash(trash: TrashReaper, path: str, run_stats: Optional[RunStats]) -> str:
+    """Verplaats naar de prullenbak van de TrashReaper (buiten `fs` om) en tel dat als een rename"""
+    start = time.perf_counter()
+    try:
+        return trash.move_to_trash(path)
+    finally:
+        if run_stats is not None:
+            run_stats.syscall("rename", time.perf_counter() - start)
+
+
+def _delta_repair(item: str, app_path: str, nieuwe_locatie: str, options: RepairOptions,
+                  step: Callable[[str], None], on_progress: Optional[ProgressCallback],
+                  fs: FileSystem, run_stats: Optional[RunStats]) -> SyncStats:
+    step(f" Bijwerken (delta-sync): {item}...")
+    start = time.monotonic()
+    on_copied = None
+    if on_progress is not None:
+        def on_copied(copied):
+            on_progress(item, copied, time.monotonic() - start)
+    with _phase(run_stats, "move"):
+        stats = sync_tree(app_path, nieuwe_locatie, options.delta_hash, on_copied, fs, options.mtime_window)
+
+    # Eerst opzij zetten zodat de symlink direct terug kan; opruimen daarna. Met een
+    # TrashReaper gaat de oude kopie meteen naar de prullenbak, zodat een volgende
+    # sweep() hem vindt als het programma stopt voordat hij verwijderd is.
+    step(f" Symlink aanmaken: {item}...")
+    with _phase(run_stats, "symlink"):
+        if options.trash is not None:
+            oud_pad = _move_to_trash(options.trash, app_path, run_stats)
+        else:
+            oud_pad = f"{app_path}.old-{os.getpid()}-{threading.get_ident()}"
+            fs.rename(app_path, oud_pad)
+        try:
+            _replace_with_symlink(nieuwe_locatie, app_path, fs)
+        except BaseException:
+            fs.rename(oud_pad, app_path)
+            raise
+    with _phase(run_stats, "rmtree"):
+        if options.trash is not None:
+            options.trash.schedule(oud_pad)
+        else:
+            fs.rmtree(oud_pad)
+    return stats
+
+
+def repair_item(item: str, symlinked_dir: str, apps_dir: str, on_step: Optional[StepCallback] = None,
+                on_progress: Optional[ProgressCallback] = None,
+                options: Optional[RepairOptions] = None, fs: FileSystem = REAL_FS,
+                stats: Optional[RunStats] = None) -> CheckResult:
+    """Verplaats de echte app terug naar SYMLINKED en maak de symlink opnieuw aan.
+
+    Staan beide mappen op hetzelfde volume, dan wordt de bundle met één
+    rename verplaatst in plaats van gekopieerd. Met `options.delta_sync`
+    wordt een bestaande kopie op een ander volume bijgewerkt met alleen de
+    gewijzigde bestanden. Met `options.trash` wordt een oude kopie niet
+    direct verwijderd maar naar de prullenbak van de TrashReaper verplaatst.
+    Delta-sync en de prullenbak werken alleen op een native `fs`.
+    """
+    def step(msg):
+        if on_step is not None:
+            on_step(item, msg)
+
+    options = options or RepairOptions()
+    start = time.monotonic()
+    app_path = os.path.join(apps_dir, item)
+    nieuwe_locatie = os.path.join(symlinked_dir, item)
+    methode = MOVE_RENAME if same_device(app_path, symlinked_dir, fs) else MOVE_COPY
+    trash = options.trash if fs.native else None
+    bytes_moved = 0
+    try:
+        if methode == MOVE_COPY and options.delta_sync and fs.native and fs.is_real_dir(nieuwe_locatie):
+            methode = MOVE_DELTA
+            sync = _delta_repair(item, app_path, nieuwe_locatie, options, step, on_progress, fs, stats)
+            return CheckResult(item, ResultStatus.FIXED,
+                               f"[OK] {item} verwerkt: bijgewerkt via delta-sync ({sync.files_copied} bestanden, "
+                               f"{sync.bytes_copied / 1_000_000:.1f} MB, {sync.removed} verwijderd) "
+                               f"en symlink opnieuw aangemaakt.", methode,
+                               sync.bytes_copied, time.monotonic() - start)
+
+        step(f" Verplaatsen: {item}...")
+        if fs.exists(nieuwe_locatie):
+            step(f" Verwijderen oude: {item}...")
+            with _phase(stats, "rmtree"):
+                if trash is not None:
+                    trash.schedule(_move_to_trash(trash, nieuwe_locatie, stats))
+                elif fs.is_real_dir(nieuwe_locatie):
+                    fs.rmtree(nieuwe_locatie)
+                else:
+                    fs.remove(nieuwe_locatie)
+
+        step(f" Verplaatsen naar: {item}...")
+        with _phase(stats, "move"):
+            if methode == MOVE_RENAME:
+                try:
+                    fs.rename(app_path, nieuwe_locatie)
+                except OSError as e:
+                    if e.errno != errno.EXDEV:
+                        raise
+                    methode = MOVE_COPY
+            if methode == MOVE_COPY:
+                bytes_moved = _move(app_path, nieuwe_locatie, item, on_progress, options, fs)
+
+        step(f" Symlink aanmaken: {item}...")
+        with _phase(stats, "symlink"):
+            _replace_with_symlink(nieuwe_locatie, app_path, fs)
+    except Exception as e:
+        return CheckResult(item, ResultStatus.ERROR, f"[FOUT] Probleem met {item}: {e}", methode,
+                           bytes_moved, time.monotonic() - start)
+    via = "via rename" if methode == MOVE_RENAME else "via kopie"
+    return CheckResult(item, ResultStatus.FIXED,
+                       f"[OK] {item} verwerkt: verplaatst {via} en symlink opnieuw aangemaakt.", methode,
+                       bytes_moved, time.monotonic() - start)
+
+
+def bundle_size(path: str, fs: FileSystem = REAL_FS) -> int:
+    """Totale grootte in bytes van een bundle, zonder symlinks te volgen"""
+    return tree_size(fs, path)
+
+
+class RepairScheduler:
+    """Voert herstelacties parallel uit in een begrensde threadpool.
+
+    Naast het aantal threads wordt ook het aantal bytes dat tegelijk
+    verplaatst wordt begrensd met `max_inflight_bytes`, zodat kleine bundles
+    doorlopen terwijl een grote bundle gekopieerd wordt. Een bundle die
+    groter is dan het budget start pas als er niets anders meer loopt;
+    een rename op hetzelfde volume en een delta-sync tellen niet mee.
+    Met een budget wordt elke bundle vooraf doorlopen om de grootte te
+    meten, dus zonder `max_inflight_bytes` wordt er niet gemeten.
+    Resultaten komen in volgorde van voltooiing binnen.
+    """
+
+    def __init__(self, symlinked_dir: str, apps_dir: str, workers: int = 4,
+                 max_inflight_bytes: Optional[int] = None, on_step: Optional[StepCallback] = None,
+                 on_progress: Optional[ProgressCallback] = None, options: Optional[RepairOptions] = None,
+                 fs: FileSystem = REAL_FS, stats: Optional[RunStats] = None):
+        self.symlinked_dir = symlinked_dir
+        self.apps_dir = apps_dir
+        self.fs = fs
+        self.stats = stats
+        self.max_inflight_bytes = max_inflight_bytes
+        self._on_step = on_step
+        self._on_progress = on_progress
+        self._options = options
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="repair")
+        self._cond = threading.Condition()
+        self._inflight_bytes = 0
+        self._running = 0
+        self._pending = 0
+        self._done = queue.Queue()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def submit(self, item: str):
+        self._pending += 1
+        self._pool.submit(self._run, item)
+
+    def _run(self, item: str):
+        try:
+            result = self._repair_within_budget(item)
+        except BaseException as e:
+            result = CheckResult(item, ResultStatus.ERROR, f"[FOUT] Probleem met {item}: {e}")
+        # Altijd een resultaat opleveren, anders blijft drain() wachten
+        self._done.put(result)
+
+    def _fits(self, size: int) -> bool:
+        if self._running == 0 or self.max_inflight_bytes is None:
+            return True
+        return self._inflight_bytes + size <= self.max_inflight_bytes
+
+    def _delta_sync_applies(self, item: str) -> bool:
+        options = self._options
+        return (options is not None and options.delta_sync and self.fs.native
+                and self.fs.is_real_dir(os.path.join(self.symlinked_dir, item)))
+
+    def _repair_within_budget(self, item: str) -> CheckResult:
+        size = 0
+        app_path = os.path.join(self.apps_dir, item)
+        # Een rename op hetzelfde volume kost geen kopieerbudget, een delta-sync
+        # kopieert alleen wat veranderd is en is vooraf niet te meten
+        if (self.max_inflight_bytes is not None and not same_device(app_path, self.symlinked_dir, self.fs)
+                and not self._delta_sync_applies(item)):
+            size = bundle_size(app_path, self.fs)
+        with self._cond:
+            while not self._fits(size):
+                self._cond.wait()
+            self._inflight_bytes += size
+            self._running += 1
+        try:
+            return repair_item(item, self.symlinked_dir, self.apps_dir, self._on_step, self._on_progress,
+                               self._options, self.fs, self.stats)
+        finally:
+            with self._cond:
+                self._inflight_bytes -= size
+                self._running -= 1
+                self._cond.notify_all()
+
+    def completed(self) -> Iterator[CheckResult]:
+        """Geef de resultaten die al klaar zijn, zonder te wachten"""
+        while self._pending:
+            try:
+                result = self._done.get_nowait()
+            except queue.Empty:
+                return
+            self._pending -= 1
+            yield result
+
+    def drain(self) -> Iterator[CheckResult]:
+        """Wacht op alle openstaande herstelacties en geef hun resultaten"""
+        while self._pending:
+            result = self._done.get()
+            self._pending -= 1
+            yield result
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+
+
+class ScanSnapshot:
+    """Compacte toestand van de vorige scan, bewaard als JSON.
+
+    Per item wordt een vingerafdruk van de entry in `apps_dir` (type en
+    inode, beide gratis uit scandir) met het resultaat opgeslagen, plus de
+    mtimes van beide mappen. Zijn die mtimes ongewijzigd, dan hoeft geen van
+    beide mappen opnieuw gelezen te worden.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: str):
+        self.path = path
+        self.data = {}
+        # Wordt door iter_scan() gezet: True als de mappen niet gewijzigd zijn
+        self.unchanged = False
+        self.reused = 0
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                self.data = data
+        except (OSError, ValueError):
+            pass
+
+    def is_current(self, key: dict, mtimes: List[int]) -> bool:
+        return self.data.get("key") == key and self.data.get("mtimes") == mtimes
+
+    def cached(self, key: dict) -> Dict[str, list]:
+        """Opgeslagen entries {item: [vingerafdruk, status, bericht]} voor deze instellingen"""
+        if self.data.get("key") != key:
+            return {}
+        return self.data.get("entries", {})
+
+    def update(self, key: dict, mtimes: List[int], entries: Dict[str, list]):
+        self.data = {"version": self.VERSION, "key": key, "mtimes": mtimes, "entries": entries}
+
+    def save(self):
+        """Schrijf atomair weg via een tijdelijk bestand"""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.data, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+
+def _fingerprint(entry: Optional[os.DirEntry]) -> Optional[list]:
+    if entry is None:
+        return None
+    return [entry_kind(entry), entry.inode()]
+
+
+def _check_items(symlinked_dir: str, apps_dir: str, skiplist: Skiplist, items: Optional[List[str]],
+                 verify_target: bool, join: bool, snapshot: Optional[ScanSnapshot],
+                 on_items: Optional[Callable[[List[str]], None]], fs: FileSystem,
+                 stats: Optional[RunStats]) -> Iterator[CheckResult]:
+    """Classificeer alle items, waar mogelijk met resultaten uit `snapshot`"""
+    key = None
+    cache = {}
+    if snapshot is not None and join:
+        key = {"symlinked_dir": symlinked_dir, "apps_dir": apps_dir, "verify_target": verify_target}
+        mtimes = [fs.stat(symlinked_dir).st_mtime_ns, fs.stat(apps_dir).st_mtime_ns]
+        cache = snapshot.cached(key)
+        snapshot.unchanged = snapshot.is_current(key, mtimes)
+        snapshot.reused = 0
+
+    if key is not None and snapshot.unchanged:
+        # Niets toegevoegd, verwijderd of vervangen: beide mappen niet lezen
+        if items is None:
+            items = list(cache)
+        if on_items is not None:
+            on_items(items)
+        missed = False
+        for item in items:
+            entry = cache.get(item)
+            if item in skiplist:
+                yield check_item(item, symlinked_dir, apps_dir, skiplist, stats=stats)
+            elif entry is None or entry[1] is None:
+                missed = True
+                result = check_item(item, symlinked_dir, apps_dir, skiplist, verify_target, fs=fs, stats=stats)
+                if entry is not None and result.status != ResultStatus.NOT_SYMLINK:
+                    entry[1:] = [result.status.value, result.bericht]
+                yield result
+            else:
+                snapshot.reused += 1
+                yield CheckResult(item, ResultStatus(entry[1]), entry[2])
+        if missed:
+            snapshot.save()
+        return
+
+    if items is None:
+        with _phase(stats, "list"):
+            items = list(index_dir(symlinked_dir, fs)) if join else list_items(symlinked_dir, fs)
+    if on_items is not None:
+        on_items(items)
+    with _phase(stats, "list"):
+        index = index_dir(apps_dir, fs) if join else None
+    entries = {}
+    for item in items:
+        if key is None:
+            yield check_item(item, symlinked_dir, apps_dir, skiplist, verify_target, index, fs, stats)
+            continue
+        fingerprint = _fingerprint(index.get(item))
+        cached = cache.get(item)
+        if item in skiplist:
+            result = check_item(item, symlinked_dir, apps_dir, skiplist, stats=stats)
+            status = cached[1:] if cached is not None and cached[0] == fingerprint else [None, None]
+        elif cached is not None and cached[0] == fingerprint and cached[1] is not None:
+            snapshot.reused += 1
+            result = CheckResult(item, ResultStatus(cached[1]), cached[2])
+            status = cached[1:]
+        else:
+            result = check_item(item, symlinked_dir, apps_dir, skiplist, verify_target, index, fs, stats)
+            status = [result.status.value, result.bericht]
+        # Items die hersteld worden veranderen nog; die volgende keer opnieuw bekijken (status None).
+        # Ze moeten wel in de snapshot blijven, anders slaat een ongewijzigde scan ze over.
+        if result.status == ResultStatus.NOT_SYMLINK:
+            status = [None, None]
+        entries[item] = [fingerprint] + status
+        yield result
+    if key is not None:
+        snapshot.update(key, mtimes, entries)
+        snapshot.save()
+
+
+def iter_scan(symlinked_dir: str, apps_dir: str, skiplist: Iterable[str] = (),
+              repair: bool = True, items: Optional[List[str]] = None,
+              on_step: Optional[StepCallback] = None, verify_target: bool = False,
+              join: bool = True, on_progress: Optional[ProgressCallback] = None,
+              repair_workers: int = 1, max_inflight_bytes: Optional[int] = None,
+              options: Optional[RepairOptions] = None, snapshot: Optional[ScanSnapshot] = None,
+              on_items: Optional[Callable[[List[str]], None]] = None,
+              fs: FileSystem = REAL_FS, stats: Optional[RunStats] = None) -> Iterator[CheckResult]:
+    """Controleer alle apps en lever per item een CheckResult op.
+
+    Dit is de synchrone variant voor gebruik in een thread; alle aanroepen
+    blokkeren. Voor een app die geen symlink meer is volgt na het
+    NOT_SYMLINK resultaat het resultaat van de herstelpoging (FIXED of
+    ERROR). Met `verify_target` wordt ook het doel van elke symlink
+    opgevraagd, zodat dode symlinks gevonden worden (dit wekt het externe
+    volume).
+
+    Met `join` (standaard) worden beide mappen één keer met scandir gelezen
+    en worden de items via een hash-join op naam geclassificeerd, in plaats
+    van per item een losse lookup in `apps_dir`.
+
+    Met `repair_workers` > 1 lopen herstelacties parallel via een
+    RepairScheduler; hun resultaten volgen dan in volgorde van voltooiing
+    in plaats van direct na het bijbehorende NOT_SYMLINK resultaat.
+    `options` bepaalt hoe een herstel wordt uitgevoerd (zie RepairOptions).
+
+    Met een `snapshot` (alleen in join-modus) worden ongewijzigde items niet
+    opnieuw geclassificeerd; zijn beide mappen sinds de vorige scan niet
+    gewijzigd, dan worden ze zelfs niet gelezen. `on_items` krijgt de lijst
+    met items zodra die bekend is, vóór het eerste resultaat.
+
+    `skiplist` mag naast exacte namen ook glob- en regex-regels bevatten;
+    ze worden hier één keer gecompileerd (zie skiplist_matcher).
+
+    Alle bestandssysteemaanroepen gaan via `fs`, bijvoorbeeld een MemoryFS
+    of een LatencyFS uit filesystem.py voor benchmarks.
+
+    Met `stats` worden tijden per fase en alle aanroepen op `fs` geteld
+    (zie run_stats.py).
+    """
+    skiplist = compile_skiplist(skiplist)
+    if stats is not None:
+        stats.start()
+        fs = CountingFS(fs, stats.syscall)
+    try:
+        results = _check_items(symlinked_dir, apps_dir, skiplist, items, verify_target, join, snapshot,
+                               on_items, fs, stats)
+        if not repair or repair_workers <= 1:
+            for result in results:
+                yield result
+                if result.status == ResultStatus.NOT_SYMLINK and repair:
+                    yield repair_item(result.item, symlinked_dir, apps_dir, on_step, on_progress, options, fs, stats)
+            return
+
+        with RepairScheduler(symlinked_dir, apps_dir, repair_workers, max_inflight_bytes,
+                             on_step, on_progress, options, fs, stats) as scheduler:
+            for result in results:
+                yield result
+                if result.status == ResultStatus.NOT_SYMLINK:
+                    scheduler.submit(result.item)
+                yield from scheduler.completed()
+            yield from scheduler.drain()
+    finally:
+        if stats is not None:
+            stats.stop()
+
+
+# Aantal resultaten dat scan() vooruit mag lopen op een trage aanroeper
+SCAN_QUEUE_SIZE = 64
+
+
+class _ScanFailed:
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+async def scan(*args, **kwargs) -> AsyncIterator[CheckResult]:
+    """Async variant van iter_scan() met dezelfde argumenten.
+
+    De scan draait in een thread (asyncio.to_thread); de resultaten komen via
+    een begrensde queue binnen, zodat de event loop niet blokkeert en de scan
+    wacht als de aanroeper achterloopt. Stopt de aanroeper eerder, dan wordt
+    de scan na het lopende item afgebroken.
+    """
+    import asyncio
+    loop = asyncio.get_running_loop()
+    results = asyncio.Queue(maxsize=SCAN_QUEUE_SIZE)
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        try:
+            future = asyncio.run_coroutine_threadsafe(results.put(item), loop)
+        except RuntimeError:
+            # De event loop is al gesloten
+            stop.set()
+            return
+        # Wachten op plaats in de queue, tenzij de aanroeper intussen gestopt is
+        while True:
+            try:
+                future.result(timeout=0.1)
+                return
+            except FutureTimeout:
+                if stop.is_set() or loop.is_closed():
+                    future.cancel()
+                    return
+
+    def run():
+        try:
+            for result in iter_scan(*args, **kwargs):
+                if stop.is_set():
+                    return
+                put(result)
+        except BaseException as e:
+            put(_ScanFailed(e))
+        finally:
+            put(done)
+
+    worker = asyncio.ensure_future(asyncio.to_thread(run))
+    try:
+        while True:
+            item = await results.get()
+            if item is done:
+                break
+            if isinstance(item, _ScanFailed):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        await worker
@@ -0,0 +1,954 @@
+"""Textual TUI van Symlink Checker; wordt pas geladen als de TUI gestart wordt."""
+import os
+import time
+from collections import Counter
+from contextlib import nullcontext
+from typing import List, Optional
+
+from textual.app import App, ComposeResult
+from textual.containers import Container, Vertical, Horizontal
+from textual.widgets import (
+    Header, Footer, Button, Input, ListView, ListItem, Label, Static,
+    ProgressBar, DataTable, Log
+)
+from textual.screen import Screen
+from textual import on, work
+from textual.message import Message
+from textual.worker import Worker, WorkerState, get_current_worker
+
+from symlink_config import (
+    compiled_skiplist, load_config, lees_skiplist, profile_dir, scan_options, update_config,
+    verwijder_uit_skiplist, voeg_toe_aan_skiplist
+)
+from run_profiler import RunProfiler
+from run_stats import RunStats
+from skiplist_matcher import Skiplist
+from symlink_engine import (
+    MOVE_COPY, MOVE_DELTA, MOVE_RENAME, REPAIR_STATUSES, CheckResult, ResultStatus, ThrottledReporter, iter_scan
+)
+from trash_reaper import TrashReaper
+
+
+# Maximaal aantal UI-updates per seconde tijdens een check
+UI_MAX_FPS = 20
+# Aantal regels dat het activiteitenlog onthoudt; oudere regels vallen eruit
+ACTIVITY_LOG_LINES = 1000
+
+
+class CheckComplete(Message):
+    def __init__(self, stats: Optional[RunStats] = None):
+        super().__init__()
+        self.stats = stats
+
+
+class CheckStarted(Message):
+    def __init__(self, total: int, first_item: str):
+        super().__init__()
+        self.total = total
+        self.first_item = first_item
+
+
+class CheckUpdate(Message):
+    def __init__(self, status: Optional[str], details: Optional[str], advance: int, logs: List[str],
+                 results: List[CheckResult]):
+        super().__init__()
+        self.status = status
+        self.details = details
+        self.advance = advance
+        self.logs = logs
+        self.results = results
+
+
+class DirModal(Screen):
+    DEFAULT_CSS = """
+    DirModal {
+        align: center middle;
+    }
+    """
+
+    def __init__(self, title: str, current: str, key: str):
+        super().__init__()
+        self.title = title
+        self.current = current
+        self.key = key
+
+    @property
+    def is_modal(self) -> bool:
+        return True
+
+    def compose(self) -> ComposeResult:
+        yield Vertical(
+            Label(self.title),
+            Input(value=self.current, id="dir_input"),
+            Horizontal(
+                Button("Save", id="save", variant="success"),
+                Button("Cancel", id="cancel", variant="error"),
+                Button("Afsluiten", id="exit", variant="error")
+            )
+        )
+
+    @on(Button.Pressed)
+    def on_button_pressed(self, event):
+        if event.button.id == "save":
+            new_dir = self.query_one(Input).value
+            if os.path.isdir(new_dir):
+                update_config(**{self.key: new_dir})
+                self.app.post_message(DirUpdated(new_dir, self.key))
+                self.app.notify("✓ Directory bijgewerkt", severity="success")
+            else:
+                self.app.notify("✗ Ongeldige directory", severity="error")
+        elif event.button.id == "exit":
+            self.app.exit()
+        self.dismiss()
+
+    def key_q(self):
+        """Afsluiten met Q toets"""
+        self.app.exit()
+
+    def key_escape(self):
+        """Afsluiten met Escape toets"""
+        self.app.exit()
+
+    def key_up(self):
+        """Navigeer omhoog met pijltjestoets"""
+        self.run_action("focus_previous")
+
+    def key_down(self):
+        """Navigeer omlaag met pijltjestoets"""
+        self.run_action("focus_next")
+
+    def key_left(self):
+        """Navigeer links met pijltjestoets"""
+        # Voor horizontale menu's: ga naar vorige knop
+        current_focus = self.focused
+        if current_focus and hasattr(current_focus, 'id'):
+            # Zoek de huidige knop en ga naar de vorige
+            buttons = self.query("Button")
+            current_index = None
+            for i, button in enumerate(buttons):
+                if button == current_focus:
+                    current_index = i
+                    break
+            
+            if current_index is not None and current_index > 0:
+                buttons[current_index - 1].focus()
+            else:
+                self.run_action("focus_previous")
+
+    def key_right(self):
+        """Navigeer rechts met pijltjestoets"""
+        # Voor horizontale menu's: ga naar volgende knop
+        current_focus = self.focused
+        if current_focus and hasattr(current_focus, 'id'):
+            # Zoek de huidige knop en ga naar de volgende
+            buttons = self.query("Button")
+            current_index = None
+            for i, button in enumerate(buttons):
+                if button == current_focus:
+                    current_index = i
+                    break
+            
+            if current_index is not None and current_index < len(buttons) - 1:
+                buttons[current_index + 1].focus()
+            else:
+                self.run_action("focus_next")
+
+
+class DirUpdated(Message):
+    def __init__(self, dir_path: str, key: str):
+        super().__init__()
+        self.dir_path = dir_path
+        self.key = key
+
+
+def skiplist_row(entry: str) -> ListItem:
+    # De regel staat in `name`: widget-id's mogen geen punten of jokertekens bevatten
+    return ListItem(Horizontal(Label(entry, classes="skiplist-item"),
+                               Button("Verwijder", name=entry, classes="remove-button")))
+
+
+class SkiplistScreen(Screen):
+    def compose(self) -> ComposeResult:
+        skiplist = sorted(lees_skiplist())
+        yield Vertical(
+            Label("Skiplist"),
+            ListView(*[skiplist_row(item) for item in skiplist], id="skiplist_list"),
+            Input(placeholder="Voeg app of patroon toe (Adobe*.app, re:...)", id="add_input"),
+            Horizontal(
+                Button("Voeg toe", id="add"),
+                Button("Terug", id="back", variant="primary"),
+                Button("Afsluiten", id="exit", variant="error")
+            )
+        )
+
+    @on(Button.Pressed)
+    def on_button_pressed(self, event):
+        if event.button.has_class("remove-button"):
+            app = event.button.name
+            if app in lees_skiplist():
+                verwijder_uit_skiplist(app)
+                event.button.query_ancestor(ListItem).remove()
+                self.app.notify(f"✓ {app} verwijderd", severity="success")
+        elif event.button.id == "add":
+            app = self.query_one("#add_input", Input).value.strip()
+            if app:
+                try:
+                    Skiplist([app])
+                except ValueError as e:
+                    self.app.notify(f"✗ {e}", severity="error")
+                    return
+                voeg_toe_aan_skiplist(app)
+                self.query_one(ListView).append(skiplist_row(app))
+                self.app.notify(f"✓ {app} toegevoegd", severity="success")
+                self.query_one("#add_input").value = ""
+        elif event.button.id == "back":
+            self.app.pop_screen()
+        elif event.button.id == "exit":
+            self.app.exit()
+
+    def key_q(self):
+        """Afsluiten met Q toets"""
+        self.app.exit()
+
+    def key_escape(self):
+        """Afsluiten met Escape toets"""
+        self.app.exit()
+
+    def key_up(self):
+        """Navigeer omhoog met pijltjestoets"""
+        self.run_action("focus_previous")
+
+    def key_down(self):
+        """Navigeer omlaag met pijltjestoets"""
+        self.run_action("focus_next")
+
+    def key_left(self):
+        """Navigeer links met pijltjestoets"""
+        # Voor horizontale menu's: ga naar vorige knop
+        current_focus = self.focused
+        if current_focus and hasattr(current_focus, 'id'):
+            # Zoek de huidige knop en ga naar de vorige
+            buttons = self.query("Button")
+            current_index = None
+            for i, button in enumerate(buttons):
+                if button == current_focus:
+                    current_index = i
+                    break
+            
+            if current_index is not None and current_index > 0:
+                buttons[current_index - 1].focus()
+            else:
+                self.run_action("focus_previous")
+
+    def key_right(self):
+        """Navigeer rechts met pijltjestoets"""
+        # Voor horizontale menu's: ga naar volgende knop
+        current_focus = self.focused
+        if current_focus and hasattr(current_focus, 'id'):
+            # Zoek de huidige knop en ga naar de volgende
+            buttons = self.query("Button")
+            current_index = None
+            for i, button in enumerate(buttons):
+                if button == current_focus:
+                    current_index = i
+                    break
+            
+            if current_index is not None and current_index < len(buttons) - 1:
+                buttons[current_index + 1].focus()
+            else:
+                self.run_action("focus_next")
+
+
+# Label per status in de resultatentabel; de volgorde is ook de sorteervolgorde
+STATUS_LABELS = {
+    ResultStatus.ERROR: "✗ Error",
+    ResultStatus.NOT_SYMLINK: "✗ Not symlink",
+    ResultStatus.MISSING: "✗ Missing",
+    ResultStatus.DANGLING: "✗ Dangling",
+    ResultStatus.WRONG_TARGET: "✗ Wrong target",
+    ResultStatus.SKIPPED: "⚠️ Skipped",
+    ResultStatus.FIXED: "✓ Fixed",
+    ResultStatus.VALID: "✓ Valid",
+}
+STATUS_ORDER = {status: i for i, status in enumerate(STATUS_LABELS)}
+
+# Aantal rijen dat de resultatentabel per keer toevoegt; de rest volgt bij het scrollen
+RESULTS_PAGE_SIZE = 500
+
+# Sorteersleutel per kolom van de resultatentabel
+SORT_KEYS = {
+    "item": lambda result: result.item.lower(),
+    "status": lambda result: STATUS_ORDER[result.status],
+    "details": lambda result: result.bericht,
+    "bytes_moved": lambda result: result.bytes_moved,
+    "duration": lambda result: result.duration,
+}
+
+
+def result_row(result: CheckResult) -> tuple:
+    if result.status == ResultStatus.VALID:
+        details = "Symlink OK"
+    else:
+        details = result.bericht
+    if result.status in REPAIR_STATUSES:
+        moved = f"{result.bytes_moved / 1_000_000:.1f}"
+        duration = f"{result.duration:.1f}s"
+    else:
+        moved = duration = ""
+    return result.item, STATUS_LABELS[result.status], details, moved, duration
+
+
+class ResultsTable(DataTable):
+    """DataTable die meldt wanneer er bijna tot onderaan gescrold is"""
+
+    class NearEnd(Message):
+        pass
+
+    @property
+    def near_end(self) -> bool:
+        # Op aantal rijen in plaats van max_scroll_y, dat pas na de layout bijgewerkt wordt
+        return self.row_count - self.scroll_y <= 2 * self.size.height
+
+    def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+        super().watch_scroll_y(old_value, new_value)
+        if self.near_end:
+            self.post_message(self.NearEnd())
+
+
+class ResultsScreen(Screen):
+    """Resultatentabel; tijdens een check komen de resultaten er live bij via add_results()"""
+
+    def __init__(self, results: Optional[List[CheckResult]] = None, expected: int = 0):
+        results = list(results or [])
+        self.results = results
+        # Tellingen per status; bijgehouden terwijl resultaten binnenkomen
+        self.counts = Counter(result.status for result in results)
+        # Aantal items dat de lopende check verwacht; 0 als de check klaar is
+        self.expected = expected
+        # None toont alles; anders alleen deze status
+        self.status_filter: Optional[ResultStatus] = None
+        self.sort_key = None
+        self.sort_reverse = False
+        # Gefilterde en gesorteerde resultaten; de tabel bevat alleen de eerste `loaded`
+        self.rows: List[CheckResult] = results
+        self.loaded = 0
+        # Tijden per fase en tellers van de check, gezet door finish()
+        self.stats: Optional[RunStats] = None
+        super().__init__()
+
+    def summary(self) -> str:
+        total = sum(n for status, n in self.counts.items() if status not in REPAIR_STATUSES)
+        valid = self.counts[ResultStatus.VALID]
+        issues = total - valid
+        percentage = (valid / total * 100) if total > 0 else 0
+        summary = f"Total Apps: {total} | Valid: {valid} ({percentage:.0f}%) | Issues: {issues}"
+        if self.counts[ResultStatus.FIXED] or self.counts[ResultStatus.ERROR]:
+            summary += f" | Fixed: {self.counts[ResultStatus.FIXED]} | Errors: {self.counts[ResultStatus.ERROR]}"
+        if self.status_filter is not None:
+            summary += f" | Filter: {STATUS_LABELS[self.status_filter]} (F)"
+        if self.loaded < len(self.rows):
+            summary += f" | Geladen: {self.loaded}/{len(self.rows)}"
+        if self.expected:
+            summary += f" | Bezig: {total}/{self.expected}"
+        return summary
+
+    def stats_summary(self) -> str:
+        if self.stats is None:
+            return ""
+        return "\n".join(self.stats.summary_lines())
+
+    def compose(self) -> ComposeResult:
+        table = ResultsTable()
+        table.add_column("App Name", key="item")
+        table.add_column("Status", key="status")
+        table.add_column("Details", key="details")
+        table.add_column("MB", key="bytes_moved")
+        table.add_column("Tijd", key="duration")
+        yield Vertical(
+            Label("Resultaten"),
+            Label(self.summary(), id="results_summary"),
+            Label(self.stats_summary(), id="results_stats", classes="status-text"),
+            Container(table, classes="results-container"),
+            Horizontal(
+                Button("Terug", id="back", variant="primary"),
+                Button("Afsluiten", id="exit", variant="error")
+            )
+        )
+
+    def on_mount(self):
+        self.refresh_table()
+
+    def refresh_table(self):
+        """Vul de tabel opnieuw volgens het huidige filter en de sortering"""
+        results = self.results
+        if self.status_filter is not None:
+            results = [result for result in results if result.status == self.status_filter]
+        if self.sort_key is not None:
+            results = sorted(results, key=SORT_KEYS[self.sort_key], reverse=self.sort_reverse)
+        self.rows = results
+        self.loaded = 0
+        self.query_one(ResultsTable).clear()
+        self.load_more()
+        self.query_one("#results_summary", Label).update(self.summary())
+
+    @on(ResultsTable.NearEnd)
+    def load_more(self):
+        """Voeg de volgende pagina rijen in één keer aan de tabel toe"""
+        if self.loaded >= len(self.rows):
+            return
+        page = self.rows[self.loaded:self.loaded + RESULTS_PAGE_SIZE]
+        self.query_one(ResultsTable).add_rows(result_row(result) for result in page)
+        self.loaded += len(page)
+        self.query_one("#results_summary", Label).update(self.summary())
+
+    def add_results(self, results: List[CheckResult]):
+        """Voeg resultaten van een lopende check toe.
+
+        Met een actieve sortering komen nieuwe rijen onderaan; finish()
+        sorteert opnieuw als de check klaar is.
+        """
+        self.results.extend(results)
+        self.counts.update(result.status for result in results)
+        if self.rows is not self.results:
+            # Gefilterde of gesorteerde weergave: een eigen lijst bijwerken
+            self.rows.extend(result for result in results
+                             if self.status_filter is None or result.status == self.status_filter)
+        if not self.is_mounted:
+            return
+        table = self.query_one(ResultsTable)
+        # Alleen direct tonen als de eerste pagina nog niet vol is of er onderaan gekeken wordt
+        if self.loaded < RESULTS_PAGE_SIZE or table.near_end:
+            self.load_more()
+        self.query_one("#results_summary", Label).update(self.summary())
+
+    def finish(self, stats: Optional[RunStats] = None):
+        """De check is klaar: stop de voortgang, toon de tijden en sorteer zo nodig opnieuw"""
+        self.expected = 0
+        self.stats = stats
+        if not self.is_mounted:
+            return
+        self.query_one("#results_stats", Label).update(self.stats_summary())
+        if self.sort_key is not None:
+            self.refresh_table()
+        else:
+            self.query_one("#results_summary", Label).update(self.summary())
+
+    @on(DataTable.HeaderSelected)
+    def sort_by_column(self, event: DataTable.HeaderSelected):
+        key = event.column_key.value
+        self.sort_reverse = not self.sort_reverse if key == self.sort_key else False
+        self.sort_key = key
+        self.refresh_table()
+
+    def key_f(self):
+        """Filter op de volgende status met F toets"""
+        statuses = [None] + [status for status in STATUS_LABELS if self.counts[status]]
+        index = statuses.index(self.status_filter) if self.status_filter in statuses else 0
+        self.status_filter = statuses[(index + 1) % len(statuses)]
+        self.refresh_table()
+
+    @on(Button.Pressed)
+    def on_button_pressed(self, event):
+        if event.button.id == "back":
+            self.app.pop_screen()
+        elif event.button.id == "exit":
+            self.app.exit()
+
+    def key_q(self):
+        """Afsluiten met Q toets"""
+        self.app.exit()
+
+    def key_escape(self):
+        """Afsluiten met Escape toets"""
+        self.app.exit()
+
+    def key_up(self):
+        """Navigeer omhoog met pijltjestoets"""
+        self.run_action("focus_previous")
+
+    def key_down(self):
+        """Navigeer omlaag met pijltjestoets"""
+        self.run_action("focus_next")
+
+    def key_left(self):
+        """Navigeer links met pijltjestoets"""
+        self.run_action("focus_previous")
+
+    def key_right(self):
+        """Navigeer rechts met pijltjestoets"""
+        self.run_action("focus_next")
+
+
+class SymlinkCheckerApp(App):
+    CSS = """
+    Screen {
+        background: #1e1e2e;
+    }
+    
+    #menu {
+        height: 100%;
+        padding: 0 1;
+    }
+    
+    /* Directory container */
+    .dirs-container {
+        background: #313244;
+        border: round #89b4fa;
+        padding: 0 1;
+        margin: 0 0 1 0;
+        height: auto;
+        overflow: auto;
+    }
+    
+    #dirs_label {
+        color: #cdd6f4;
+        text-align: left;
+        height: auto;
+    }
+
+    /* Top toolbar */
+    #toolbar {
+        height: 3;
+        padding: 0;
+        margin: 0 0 0 0;
+        content-align: left middle;
+    }
+    
+    /* Button styling */
+    Button {
+        margin: 0 1;
+        height: 3;
+        background: #45475a;
+        color: #cdd6f4;
+        content-align: center middle;
+        padding: 0 2;
+    }
+    
+    Button:hover {
+        background: #585b70;
+    }
+    
+    Button:focus {
+        background: #585b70;
+    }
+    
+    Button:disabled {
+        opacity: 0.6;
+        content-align: center middle;
+    }
+    
+    Button.-primary {
+        background: #89b4fa;
+        color: #1e1e2e;
+    }
+    
+    Button.-primary:hover {
+        background: #b4befe;
+    }
+    
+    Button.-success {
+        background: #a6e3a1;
+        color: #1e1e2e;
+    }
+    
+    Button.-success:hover {
+        background: #b8e8b3;
+    }
+    
+    Button.-error {
+        background: #f38ba8;
+        color: #1e1e2e;
+    }
+    
+    Button.-error:hover {
+        background: #f5a3b8;
+    }
+    
+    Horizontal {
+        height: auto;
+    }
+    
+    /* Progress bar */
+    ProgressBar {
+        background: #313244;
+        border: round #89b4fa;
+        margin: 1 0;
+    }
+    
+    ProgressBar > .bar--bar {
+        color: #a6e3a1;
+    }
+    
+    /* Status labels */
+    .status-text {
+        background: #313244;
+        padding: 1 2;
+        margin: 0 0 1 0;
+        border: round #89b4fa;
+        color: #cdd6f4;
+    }
+    
+    /* Activity log */
+    #activity_log {
+        height: 20;
+        border: round #89b4fa;
+        background: #313244;
+        min-height: 20;
+        max-height: 20;
+        margin: 0 0;
+    }
+    
+    #activity_log {
+        padding: 0 1;
+        color: #cdd6f4;
+    }
+    
+    /* DataTable */
+    DataTable {
+        border: round #89b4fa;
+        background: #313244;
+    }
+    
+    DataTable > .datatable--header {
+        background: #45475a;
+        color: #89b4fa;
+        text-style: bold;
+    }
+    
+    /* Input fields */
+    Input {
+        border: round #89b4fa;
+        background: #313244;
+        padding: 1 2;
+        margin: 1 0;
+        color: #cdd6f4;
+    }
+    
+    Input:focus {
+        border: round #f38ba8;
+    }
+    
+    /* Notifications */
+    .notification.success {
+        background: #a6e3a1;
+        color: #1e1e2e;
+    }
+    
+    .notification.error {
+        background: #f38ba8;
+        color: #1e1e2e;
+    }
+    
+    .notification.warning {
+        background: #f9e2af;
+        color: #1e1e2e;
+    }
+    
+    /* Skiplist */
+    .skiplist-item {
+        color: #9399b2;
+    }
+    
+    .remove-button {
+        background: #f38ba8;
+        color: #1e1e2e;
+        min-width: 12;
+    }
+    
+    .remove-button:hover {
+        background: #f5a3b8;
+    }
+    
+    ListView {
+        height: 60%;
+        border: round #89b4fa;
+        background: #313244;
+    }
+    
+    #skiplist_list {
+        height: 10;
+        margin: 1 0;
+    }
+    
+    /* Results container */
+    .results-container {
+        height: 20;
+        max-height: 20;
+        overflow-y: auto;
+        border: round #89b4fa;
+        background: #313244;
+        margin: 1 0;
+    }
+    
+    /* Modal */
+    DirModal {
+        align: center middle;
+    }
+    
+    DirModal > Vertical {
+        background: #313244;
+        border: thick #89b4fa;
+        padding: 2;
+        width: 60;
+    }
+    
+    DirModal Label {
+        text-align: center;
+        text-style: bold;
+        color: #89b4fa;
+        margin-bottom: 1;
+    }
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.title = "Symlink Checker TUI"
+        self.config = load_config()
+        self.trash_reaper = TrashReaper()
+        # Resultaten van de laatste check; gevuld terwijl de check loopt
+        self.results_screen: Optional[ResultsScreen] = None
+
+    def compose(self) -> ComposeResult:
+        yield Header()
+        yield Container(
+            Vertical(
+                Container(
+                    Static(f"📁 Symlink: {self.config['symlinked_dir']}\n📂 Apps: {self.config['apps_dir']}", id="dirs_label"),
+                    classes="dirs-container"
+                ),
+                Horizontal(
+                    Button(" Check", id="run_check", variant="primary"),
+                    Button(" Symlink", id="set_sym"),
+                    Button(" Apps", id="set_apps"),
+                    Button(" Skip", id="skiplist"),
+                    Button(" Results", id="show_results", disabled=True),
+                    Button(" Exit", id="exit", variant="error"),
+                    id="toolbar"
+                ),
+                Log(max_lines=self.config.get("activity_log_lines", ACTIVITY_LOG_LINES), id="activity_log"),
+                id="menu"
+            )
+        )
+        yield Footer()
+
+    @on(Button.Pressed, "#run_check")
+    def run_check(self):
+        self.query_one("#run_check", Button).disabled = True
+        self._perform_check()
+
+    @work(thread=True, exclusive=True, group="check")
+    def _perform_check(self):
+        """Voert de check uit in een thread; de UI wordt via berichten bijgewerkt"""
+        worker = get_current_worker()
+        dir_path = self.config["symlinked_dir"]
+        apps_path = self.config["apps_dir"]
+        skiplist = compiled_skiplist()
+        for message in skiplist.invalid:
+            self.call_from_thread(self.notify, f"⚠️ {message} (regel overgeslagen)", severity="warning")
+        total = 0
+
+        def on_items(items):
+            nonlocal total
+            total = len(items)
+            if total:
+                self.post_message(CheckStarted(total, items[0]))
+
+        deferred_delete = self.config.get("deferred_delete", True)
+        if deferred_delete:
+            self.trash_reaper.sweep(dir_path)
+            self.trash_reaper.sweep(apps_path)
+        kwargs = scan_options(self.config, self.trash_reaper if deferred_delete else None)
+        snapshot = kwargs["snapshot"]
+
+        def on_progress(item, copied, elapsed):
+            mb = copied / 1_000_000
+            rate = mb / elapsed if elapsed > 0 else 0.0
+            reporter.details(f" Verplaatsen naar: {item}... {mb:.1f} MB ({rate:.1f} MB/s)")
+            reporter.maybe_flush()
+
+        current = 0
+        methodes = {MOVE_RENAME: 0, MOVE_COPY: 0, MOVE_DELTA: 0}
+        stats = RunStats()
+
+        # Het volledige log eventueel ook naar een bestand; in de TUI blijven alleen de laatste regels
+        log_file = self.config.get("activity_log_file")
+        spill = open(log_file, "a", encoding="utf-8") if log_file else None
+        if spill is not None:
+            spill.write(f"--- Check gestart {time.strftime('%Y-%m-%d %H:%M:%S')} ---\n")
+        reporter = ThrottledReporter(
+            lambda *update: self.post_message(CheckUpdate(*update)),
+            max_fps=self.config.get("ui_max_fps", UI_MAX_FPS),
+            max_logs=self.config.get("activity_log_lines", ACTIVITY_LOG_LINES),
+            spill=spill,
+        )
+        profiler = RunProfiler(profile_dir(self.config)) if self.config.get("profile", False) else None
+        try:
+            # Auto-process mode: broken symlinks worden altijd hersteld
+            with profiler if profiler is not None else nullcontext():
+                for result in iter_scan(dir_path, apps_path, skiplist, repair=True,
+                                        on_step=lambda item, msg: reporter.log(msg),
+                                        on_progress=on_progress, on_items=on_items, stats=stats, **kwargs):
+                    reporter.result(result)
+                    if result.status == ResultStatus.FIXED:
+                        methodes[result.methode] += 1
+                        reporter.log(f"✓ {result.item} succesvol verwerkt! "
+                                     f"({result.methode}, {result.duration:.1f}s)")
+                    elif result.status == ResultStatus.ERROR:
+                        reporter.log(f"✗ {result.bericht}")
+                    else:
+                        current += 1
+                        reporter.advance(1)
+                        reporter.status(f"⏳ Checking: {result.item} ({current}/{total})")
+                        reporter.log(result.bericht)
+                    reporter.maybe_flush()
+                    if worker.is_cancelled:
+                        break
+            if profiler is not None:
+                reporter.log(profiler.summary())
+            if total == 0:
+                self.call_from_thread(self.notify, "⚠️ Geen .app items gevonden in de directory.", severity="warning")
+                return
+            if snapshot is not None and snapshot.unchanged:
+                reporter.log("Geen wijzigingen sinds de vorige scan")
+            if any(methodes.values()):
+                reporter.log(f"Hersteld: {methodes[MOVE_RENAME]} via rename, {methodes[MOVE_COPY]} via kopie, "
+                             f"{methodes[MOVE_DELTA]} via delta-sync")
+            reporter.flush()
+            self.post_message(CheckComplete(stats))
+        finally:
+            if spill is not None:
+                spill.close()
+
+    @on(CheckStarted)
+    def show_check_progress(self, msg: CheckStarted):
+        self.mount(ProgressBar(total=msg.total, id="check_progress"))
+        self.mount(Label(" Checking: " + msg.first_item, id="check_status", classes="status-text"))
+        self.mount(Label("", id="check_details", classes="status-text"))
+        self.query_one("#activity_log", Log).clear()
+        # Geïnstalleerd zodat het scherm na "Terug" opnieuw geopend kan worden
+        if self.results_screen is not None:
+            self.uninstall_screen(self.results_screen)
+        self.results_screen = ResultsScreen(expected=msg.total)
+        self.install_screen(self.results_screen, name="results")
+        self.query_one("#show_results", Button).disabled = False
+        if self.config.get("live_results", True):
+            self.push_screen("results")
+
+    @on(CheckUpdate)
+    def update_check_progress(self, msg: CheckUpdate):
+        if msg.advance:
+            self.query_one("#check_progress", ProgressBar).advance(msg.advance)
+        if msg.status is not None:
+            self.query_one("#check_status", Label).update(msg.status)
+        if msg.details is not None:
+            self.query_one("#check_details", Label).update(msg.details)
+        if msg.logs:
+            self.query_one("#activity_log", Log).write_lines(msg.logs)
+        if msg.results and self.results_screen is not None:
+            self.results_screen.add_results(msg.results)
+
+    @on(Worker.StateChanged)
+    def check_worker_finished(self, event: Worker.StateChanged):
+        if event.worker.group == "check" and event.state in (WorkerState.SUCCESS, WorkerState.ERROR, WorkerState.CANCELLED):
+            self.query_one("#run_check", Button).disabled = False
+
+    @on(CheckComplete)
+    def show_results(self, msg: CheckComplete):
+        for widget_id in ("#check_progress", "#check_status", "#check_details"):
+            self.query(widget_id).remove()
+        self.results_screen.finish(msg.stats)
+        if self.screen is not self.results_screen:
+            self.push_screen("results")
+
+    @on(Button.Pressed, "#show_results")
+    def open_results(self):
+        self.push_screen("results")
+
+    @on(Button.Pressed, "#set_sym")
+    def set_sym_dir(self):
+        self.push_screen(DirModal("Symlink Directory instellen", self.config["symlinked_dir"], "symlinked_dir"))
+
+    @on(Button.Pressed, "#set_apps")
+    def set_apps_dir(self):
+        self.push_screen(DirModal("Apps Directory instellen", self.config["apps_dir"], "apps_dir"))
+
+    @on(DirUpdated)
+    def update_dir_labels(self, msg: DirUpdated):
+        if msg.key == "symlinked_dir":
+            self.config["symlinked_dir"] = msg.dir_path
+        elif msg.key == "apps_dir":
+            self.config["apps_dir"] = msg.dir_path
+        self.query_one("#dirs_label", Static).update(f"📁 Symlink: {self.config['symlinked_dir']}\n📂 Apps: {self.config['apps_dir']}")
+
+    @on(Button.Pressed, "#skiplist")
+    def open_skiplist(self):
+        self.push_screen(SkiplistScreen())
+
+    @on(Button.Pressed, "#exit")
+    def exit_app(self):
+        self.exit()
+
+    def on_confirm_quit(self, event):
+        event.confirm = True
+
+    def key_q(self):
+        """Afsluiten met Q toets"""
+        self.exit()
+
+    def key_escape(self):
+        """Afsluiten met Escape toets"""
+        self.exit()
+
+    def key_p(self):
+        """Profiler aan/uit zetten met P toets"""
+        enabled = not self.config.get("profile", False)
+        self.config["profile"] = enabled
+        update_config(profile=enabled)
+        if enabled:
+            self.notify(f"🔬 Profiler aan: volgende checks schrijven een profiel naar {profile_dir(self.config)}")
+        else:
+            self.notify("Profiler uit")
+
+    def key_up(self):
+        """Navigeer omhoog met pijltjestoets"""
+        self.run_action("focus_previous")
+
+    def key_down(self):
+        """Navigeer omlaag met pijltjestoets"""
+        self.run_action("focus_next")
+
+    def key_left(self):
+        """Navigeer links met pijltjestoets"""
+        # Voor horizontale menu's: ga naar vorige knop
+        current_focus = self.focused
+        if current_focus and hasattr(current_focus, 'id'):
+            # Zoek de huidige knop en ga naar de vorige
+            buttons = self.query("Button")
+            current_index = None
+            for i, button in enumerate(buttons):
+                if button == current_focus:
+                    current_index = i
+                    break
+            
+            if current_index is not None and current_index > 0:
+                buttons[current_index - 1].focus()
+            else:
+                self.run_action("focus_previous")
+
+    def key_right(self):
+        """Navigeer rechts met pijltjestoets"""
+        # Voor horizontale menu's: ga naar volgende knop
+        current_focus = self.focused
+        if current_focus and hasattr(current_focus, 'id'):
+            # Zoek de huidige knop en ga naar de volgende
+            buttons = self.query("Button")
+            current_index = None
+            for i, button in enumerate(buttons):
+                if button == current_focus:
+                    current_index = i
+                    break
+            
+            if current_index is not None and current_index < len(buttons) - 1:
+                buttons[current_index + 1].focus()
+            else:
+                self.run_action("focus_next")
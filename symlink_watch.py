@@ -0,0 +1,211 @@
+"""Watch-modus: herstel symlinks zodra een updater ze vervangt.
+
+In plaats van steeds alles opnieuw te scannen wordt op wijzigingen in
+`apps_dir` en `symlinked_dir` gewacht (inotify op Linux, anders door de
+mtimes van beide mappen te pollen). Per gewijzigd item wordt gewacht tot
+het een tijd stil is en de bundle niet meer groeit; daarna wordt alleen
+dat item geclassificeerd en zo nodig hersteld.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import stat
+import struct
+import sys
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from skiplist_matcher import compile_skiplist
+from symlink_engine import (
+    CheckResult, ProgressCallback, RepairOptions, ResultStatus, StepCallback, check_item, entry_kind,
+    is_app_name, repair_item
+)
+
+SETTLE_SECONDS = 5.0
+POLL_INTERVAL = 2.0
+
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_WATCH_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_ONLYDIR
+_EVENT = struct.Struct("iIII")
+
+# Speciale naam: de kernel-wachtrij is overgelopen, alles opnieuw bekijken
+OVERFLOW = object()
+
+
+class InotifyWatcher:
+    """Minimale inotify-binding via ctypes voor de bovenste laag van een paar mappen"""
+
+    def __init__(self, paths: Iterable[str]):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 mislukt")
+        for path in paths:
+            if libc.inotify_add_watch(self._fd, os.fsencode(path), _WATCH_MASK) < 0:
+                err = ctypes.get_errno()
+                os.close(self._fd)
+                raise OSError(err, os.strerror(err), path)
+
+    @staticmethod
+    def available() -> bool:
+        return sys.platform.startswith("linux")
+
+    def read(self, timeout: float) -> List[object]:
+        """Wacht maximaal `timeout` seconden en geef de namen uit de events"""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        names = []
+        offset = 0
+        while offset < len(data):
+            _wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            if mask & IN_Q_OVERFLOW:
+                names.append(OVERFLOW)
+            elif length:
+                names.append(os.fsdecode(data[offset:offset + length].rstrip(b"\0")))
+            offset += length
+        return names
+
+    def close(self):
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """Terugval zonder inotify: vergelijkt mtimes en daarna de lijst met entries"""
+
+    def __init__(self, paths: Iterable[str], interval: float = POLL_INTERVAL):
+        self.paths = list(paths)
+        self.interval = interval
+        self._state = {path: self._snapshot(path) for path in self.paths}
+
+    @staticmethod
+    def _snapshot(path: str) -> Tuple[int, Dict[str, tuple]]:
+        mtime = os.stat(path).st_mtime_ns
+        with os.scandir(path) as it:
+            # Type erbij: een vervangen symlink krijgt vaak hetzelfde inode-nummer
+            return mtime, {entry.name: (entry_kind(entry), entry.inode()) for entry in it}
+
+    def read(self, timeout: float) -> List[object]:
+        time.sleep(min(timeout, self.interval))
+        names = []
+        for path in self.paths:
+            old_mtime, old_entries = self._state[path]
+            if os.stat(path).st_mtime_ns == old_mtime:
+                continue
+            mtime, entries = self._snapshot(path)
+            self._state[path] = (mtime, entries)
+            names.extend(name for name in entries.keys() | old_entries.keys()
+                         if entries.get(name) != old_entries.get(name))
+        return names
+
+    def close(self):
+        pass
+
+
+def _signature(path: str) -> Optional[tuple]:
+    """Grove vingerafdruk van een entry; verandert zolang een updater nog schrijft"""
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return None
+    if stat.S_ISLNK(st.st_mode):
+        return ("link", os.readlink(path))
+    if not stat.S_ISDIR(st.st_mode):
+        return ("file", st.st_size, st.st_mtime_ns)
+    count = size = newest = 0
+    for root, dirs, files in os.walk(path):
+        for name in dirs + files:
+            try:
+                entry_st = os.lstat(os.path.join(root, name))
+            except OSError:
+                continue
+            count += 1
+            size += entry_st.st_size
+            newest = max(newest, entry_st.st_mtime_ns)
+    return ("dir", count, size, newest)
+
+
+def iter_watch(symlinked_dir: str, apps_dir: str, skiplist: Iterable[str] = (), repair: bool = True,
+               settle: float = SETTLE_SECONDS, verify_target: bool = False,
+               options: Optional[RepairOptions] = None, on_step: Optional[StepCallback] = None,
+               on_progress: Optional[ProgressCallback] = None,
+               stop: Optional[threading.Event] = None) -> Iterator[CheckResult]:
+    """Blijf wijzigingen volgen en lever een CheckResult per gewijzigd item.
+
+    Een item wordt pas bekeken als er `settle` seconden geen events voor
+    binnenkwamen en de bundle in `apps_dir` tussen twee metingen niet meer
+    veranderd is. Stopt als `stop` gezet wordt.
+
+    Na een herstel worden events voor dat item een settle-periode genegeerd:
+    dat zijn de rename en symlink van het herstel zelf.
+    """
+    skiplist = compile_skiplist(skiplist)
+    stop = stop or threading.Event()
+    paths = [apps_dir, symlinked_dir]
+    watcher = None
+    if InotifyWatcher.available():
+        try:
+            watcher = InotifyWatcher(paths)
+        except OSError:
+            # Bijvoorbeeld max_user_watches of max_user_instances bereikt
+            pass
+    if watcher is None:
+        watcher = PollingWatcher(paths)
+    # naam -> (deadline, laatste handtekening)
+    pending: Dict[str, Tuple[float, Optional[tuple]]] = {}
+    # naam -> tijdstip tot wanneer events genegeerd worden
+    quiet_until: Dict[str, float] = {}
+    # De polling-watcher ziet de events van een herstel pas bij de volgende poll
+    quiet = max(settle, watcher.interval) if isinstance(watcher, PollingWatcher) else settle
+    try:
+        while not stop.is_set():
+            now = time.monotonic()
+            timeout = min([deadline for deadline, _ in pending.values()], default=now + 1.0) - now
+            for name in watcher.read(max(0.0, min(timeout, 1.0))):
+                if name is OVERFLOW:
+                    names = {entry for path in paths for entry in os.listdir(path)}
+                else:
+                    names = [name]
+                now = time.monotonic()
+                for entry in names:
+                    if quiet_until.get(entry, 0.0) > now:
+                        continue
+                    quiet_until.pop(entry, None)
+                    if is_app_name(entry):
+                        pending[entry] = (now + settle, None)
+
+            now = time.monotonic()
+            for item, (deadline, last_signature) in list(pending.items()):
+                if deadline > now:
+                    continue
+                signature = _signature(os.path.join(apps_dir, item))
+                if signature is not None and signature[0] == "dir" and signature != last_signature:
+                    # Bundle nog niet twee keer gelijk gemeten: nog een ronde wachten
+                    pending[item] = (now + settle, signature)
+                    continue
+                del pending[item]
+                if not os.path.lexists(os.path.join(symlinked_dir, item)):
+                    # Alleen apps die in SYMLINKED staan worden beheerd
+                    continue
+                result = check_item(item, symlinked_dir, apps_dir, skiplist, verify_target)
+                yield result
+                if result.status == ResultStatus.NOT_SYMLINK and repair:
+                    repaired = repair_item(item, symlinked_dir, apps_dir, on_step, on_progress, options)
+                    quiet_until[item] = time.monotonic() + quiet
+                    yield repaired
+    finally:
+        watcher.close()
@@ -0,0 +1,66 @@
+"""Tests voor de bestandssysteemlaag"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from collections import Counter  # noqa: E402
+
+from filesystem import REAL_FS, CountingFS, LatencyFS, MemoryFS  # noqa: E402
+from symlink_engine import sync_tree  # noqa: E402
+
+
+class LatencyFSTest(unittest.TestCase):
+    def setUp(self):
+        self.inner = MemoryFS()
+        self.inner.makedirs("/Volumes/Extern/SYMLINKED/Foo.app")
+        self.inner.makedirs("/Applications")
+        self.inner.symlink("/Volumes/Extern/SYMLINKED/Foo.app", "/Applications/Foo.app")
+        self.fs = LatencyFS(self.inner, latency=0, paths=["/Volumes/Extern"])
+
+    def test_following_a_symlink_into_the_slow_volume_is_delayed(self):
+        self.assertTrue(self.fs.exists("/Applications/Foo.app"))
+        self.fs.stat("/Applications/Foo.app")
+        self.assertEqual(self.fs.calls, 2)
+
+    def test_the_link_itself_is_not_delayed(self):
+        self.fs.lstat("/Applications/Foo.app")
+        self.fs.readlink("/Applications/Foo.app")
+        self.assertEqual(self.fs.calls, 0)
+
+    def test_native_is_passed_through(self):
+        self.assertFalse(self.fs.native)
+        self.assertTrue(LatencyFS(REAL_FS).native)
+
+
+class SyncTreeTest(unittest.TestCase):
+    def test_delta_sync_goes_through_the_filesystem(self):
+        inner = MemoryFS()
+        inner.makedirs("/A/Foo.app/Contents/Resources")
+        inner.write_file("/A/Foo.app/Contents/Info.plist", 100)
+        inner.write_file("/A/Foo.app/Contents/Resources/nieuw.bin", 200)
+        inner.makedirs("/S/Foo.app/Contents")
+        inner.write_file("/S/Foo.app/Contents/oud.bin", 300)
+        calls = Counter()
+        stats = sync_tree("/A/Foo.app", "/S/Foo.app", fs=CountingFS(inner, lambda name, _: calls.update([name])))
+        self.assertEqual((stats.files_copied, stats.bytes_copied, stats.removed), (2, 300, 1))
+        self.assertEqual(sorted(inner.listdir("/S/Foo.app/Contents")), ["Info.plist", "Resources"])
+        self.assertEqual((calls["copy_file"], calls["mkdir"], calls["remove"]), (2, 1, 1))
+
+    def test_mtimes_are_compared_exactly_unless_a_window_is_given(self):
+        def library():
+            fs = MemoryFS()
+            fs.makedirs("/A/Foo.app")
+            fs.makedirs("/S/Foo.app")
+            # Zelfde grootte, net iets andere mtime
+            fs.write_file("/S/Foo.app/main", 100)
+            fs.write_file("/A/Foo.app/main", 100)
+            return fs
+
+        self.assertEqual(sync_tree("/A/Foo.app", "/S/Foo.app", fs=library()).files_copied, 1)
+        self.assertEqual(sync_tree("/A/Foo.app", "/S/Foo.app", fs=library(), mtime_window=2.0).files_copied, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+"""Tests voor de async scan()"""
+import asyncio
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import symlink_engine  # noqa: E402
+from filesystem import MemoryFS  # noqa: E402
+from symlink_engine import ResultStatus, iter_scan, scan  # noqa: E402
+
+
+def make_library(count: int) -> MemoryFS:
+    fs = MemoryFS()
+    fs.makedirs("/S")
+    fs.makedirs("/A")
+    for i in range(count):
+        fs.makedirs(f"/S/App{i}.app")
+        fs.symlink(f"/S/App{i}.app", f"/A/App{i}.app")
+    return fs
+
+
+class AsyncScanTest(unittest.TestCase):
+    def test_same_results_as_iter_scan(self):
+        fs = make_library(20)
+
+        async def collect():
+            return [result async for result in scan("/S", "/A", repair=False, fs=fs)]
+
+        results = asyncio.run(collect())
+        self.assertEqual(results, list(iter_scan("/S", "/A", repair=False, fs=fs)))
+        self.assertTrue(all(result.status == ResultStatus.VALID for result in results))
+
+    def test_errors_are_raised_in_the_caller(self):
+        async def collect():
+            return [result async for result in scan("/bestaat-niet", "/A", repair=False, fs=MemoryFS())]
+
+        with self.assertRaises(FileNotFoundError):
+            asyncio.run(collect())
+
+    def test_event_loop_keeps_running(self):
+        fs = make_library(200)
+
+        async def main():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0)
+
+            task = asyncio.create_task(ticker())
+            count = 0
+            async for _ in scan("/S", "/A", repair=False, fs=fs):
+                count += 1
+                if count == 10:
+                    break
+            task.cancel()
+            return count, ticks
+
+        count, ticks = asyncio.run(main())
+        self.assertEqual(count, 10)
+        self.assertGreater(ticks, 0)
+
+    def test_worker_waits_for_a_slow_consumer(self):
+        produced = []
+
+        def fake_iter_scan(*args, **kwargs):
+            for i in range(100):
+                produced.append(i)
+                yield i
+
+        async def consume():
+            seen = []
+            ahead = None
+            async for result in scan():
+                seen.append(result)
+                if len(seen) == 1:
+                    await asyncio.sleep(0.3)
+                    ahead = len(produced)
+            return seen, ahead
+
+        with mock.patch.object(symlink_engine, "iter_scan", fake_iter_scan), \
+                mock.patch.object(symlink_engine, "SCAN_QUEUE_SIZE", 4):
+            seen, ahead = asyncio.run(consume())
+        self.assertEqual(seen, list(range(100)))
+        # Eén gelezen, vier in de queue en één die op plaats wacht
+        self.assertLessEqual(ahead, 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
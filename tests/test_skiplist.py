@@ -0,0 +1,30 @@
+"""Tests voor de skiplist-matcher"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skiplist_matcher import Skiplist  # noqa: E402
+
+
+class SkiplistTest(unittest.TestCase):
+    def test_invalid_regex_raises_when_strict(self):
+        with self.assertRaises(ValueError):
+            Skiplist(["re:Adobe("])
+
+    def test_invalid_regex_is_skipped_when_not_strict(self):
+        skiplist = Skiplist(["re:Adobe(", "Google*.app", "Foo.app"], strict=False)
+        self.assertEqual(len(skiplist.invalid), 1)
+        self.assertIn("Google Chrome.app", skiplist)
+        self.assertIn("Foo.app", skiplist)
+        self.assertNotIn("Adobe Photoshop.app", skiplist)
+
+    def test_entry_with_brackets_matches_its_own_name(self):
+        skiplist = Skiplist(["Foo [Beta].app"])
+        self.assertIn("Foo [Beta].app", skiplist)
+        self.assertIn("Foo B.app", skiplist)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""Regressietests voor de scan-snapshot, op een MemoryFS"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from filesystem import MemoryFS  # noqa: E402
+from symlink_engine import ResultStatus, ScanSnapshot, iter_scan  # noqa: E402
+
+SYMLINKED = "/Volumes/Extern/SYMLINKED"
+APPS = "/Applications"
+
+
+def make_library() -> MemoryFS:
+    fs = MemoryFS()
+    fs.makedirs(SYMLINKED)
+    fs.makedirs(APPS)
+    for name in ("Foo.app", "Bar.app"):
+        fs.makedirs(os.path.join(SYMLINKED, name))
+    # Foo.app is door een updater vervangen door een echte bundle
+    fs.makedirs(os.path.join(APPS, "Foo.app", "Contents"))
+    fs.symlink(os.path.join(SYMLINKED, "Bar.app"), os.path.join(APPS, "Bar.app"))
+    return fs
+
+
+class SnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.state_file = os.path.join(self.tmp.name, "scan_state.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def scan(self, fs, repair, snapshot=None):
+        snapshot = snapshot or ScanSnapshot(self.state_file)
+        results = iter_scan(SYMLINKED, APPS, repair=repair, snapshot=snapshot, fs=fs)
+        return {(result.item, result.status) for result in results}
+
+    def test_not_symlink_is_reported_again_when_unchanged(self):
+        fs = make_library()
+        expected = {("Foo.app", ResultStatus.NOT_SYMLINK), ("Bar.app", ResultStatus.VALID)}
+        self.assertEqual(self.scan(fs, repair=False), expected)
+        # Geen van beide mappen is gewijzigd: de snapshot mag Foo.app niet kwijtraken
+        for _ in range(2):
+            snapshot = ScanSnapshot(self.state_file)
+            self.assertEqual(self.scan(fs, repair=False, snapshot=snapshot), expected)
+            self.assertTrue(snapshot.unchanged)
+
+    def test_not_symlink_is_repaired_on_a_later_run(self):
+        fs = make_library()
+        self.scan(fs, repair=False)
+        results = self.scan(fs, repair=True)
+        self.assertIn(("Foo.app", ResultStatus.NOT_SYMLINK), results)
+        self.assertIn(("Foo.app", ResultStatus.FIXED), results)
+        self.assertEqual(fs.readlink(os.path.join(APPS, "Foo.app")), os.path.join(SYMLINKED, "Foo.app"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+"""Tests voor de watch-modus"""
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from symlink_engine import ResultStatus  # noqa: E402
+from symlink_watch import InotifyWatcher, PollingWatcher, iter_watch  # noqa: E402
+
+
+class WatchRepairTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.apps = os.path.join(self.root, "apps")
+        self.symlinked = os.path.join(self.root, "symlinked")
+        os.makedirs(os.path.join(self.symlinked, "Foo.app", "Contents"))
+        os.mkdir(self.apps)
+        os.symlink(os.path.join(self.symlinked, "Foo.app"), os.path.join(self.apps, "Foo.app"))
+
+    def test_own_repair_does_not_trigger_a_new_check(self):
+        stop = threading.Event()
+        results = []
+
+        def watch():
+            for result in iter_watch(self.symlinked, self.apps, settle=0.3, stop=stop):
+                results.append(result.status)
+
+        thread = threading.Thread(target=watch)
+        thread.start()
+        try:
+            time.sleep(0.3)
+            # Updater vervangt de symlink door een echte bundle
+            os.remove(os.path.join(self.apps, "Foo.app"))
+            os.makedirs(os.path.join(self.apps, "Foo.app", "Contents"))
+            time.sleep(2.5)
+        finally:
+            stop.set()
+            thread.join()
+        self.assertEqual(results, [ResultStatus.NOT_SYMLINK, ResultStatus.FIXED])
+
+    def test_falls_back_to_polling_when_inotify_fails(self):
+        stop = threading.Event()
+        stop.set()
+        limit = OSError(28, "No space left on device")
+        with mock.patch.object(InotifyWatcher, "available", return_value=True), \
+                mock.patch.object(InotifyWatcher, "__init__", side_effect=limit), \
+                mock.patch.object(PollingWatcher, "close") as close:
+            self.assertEqual(list(iter_watch(self.symlinked, self.apps, stop=stop)), [])
+        close.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
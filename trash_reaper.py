@@ -0,0 +1,126 @@
+"""Uitgestelde verwijdering van vervangen bundles.
+
+In plaats van een oude bundle direct met shutil.rmtree te verwijderen wordt
+hij met één rename naar een verborgen prullenbak op hetzelfde volume
+verplaatst. Een achtergrondthread met lage prioriteit ruimt de prullenbak
+daarna op met unlinks relatief aan een open map (dir_fd).
+"""
+import os
+import queue
+import shutil
+import stat
+import threading
+import time
+
+TRASH_DIRNAME = ".symlink-checker-trash"
+
+_HAS_DIR_FD = {os.open, os.stat, os.unlink, os.rmdir} <= os.supports_dir_fd and os.scandir in os.supports_fd
+
+
+def trash_dir_for(path: str) -> str:
+    """Prullenbak op hetzelfde volume als `path` (naast het item)"""
+    return os.path.join(os.path.dirname(os.path.abspath(path)), TRASH_DIRNAME)
+
+
+def _rmtree_at(dir_fd: int, name: str):
+    st = os.stat(name, dir_fd=dir_fd, follow_symlinks=False)
+    if not stat.S_ISDIR(st.st_mode):
+        os.unlink(name, dir_fd=dir_fd)
+        return
+    fd = os.open(name, os.O_RDONLY | os.O_DIRECTORY | os.O_NOFOLLOW, dir_fd=dir_fd)
+    try:
+        with os.scandir(fd) as it:
+            entries = [(entry.name, entry.is_dir(follow_symlinks=False)) for entry in it]
+        for child, is_dir in entries:
+            if is_dir:
+                _rmtree_at(fd, child)
+            else:
+                os.unlink(child, dir_fd=fd)
+    finally:
+        os.close(fd)
+    os.rmdir(name, dir_fd=dir_fd)
+
+
+def remove_tree(path: str):
+    """Verwijder een map of bestand, met dir_fd-relatieve unlinks waar mogelijk"""
+    if not _HAS_DIR_FD:
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+        return
+    parent_fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        _rmtree_at(parent_fd, os.path.basename(path))
+    finally:
+        os.close(parent_fd)
+
+
+class TrashReaper:
+    """Verplaatst items naar de prullenbak en verwijdert ze op de achtergrond.
+
+    De thread draait als daemon; wat bij afsluiten nog in de prullenbak
+    staat wordt bij een volgende sweep() opgepakt.
+    """
+
+    def __init__(self, niceness: int = 19):
+        self.niceness = niceness
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def move_to_trash(path: str) -> str:
+        """Verplaats `path` atomair naar de prullenbak zonder het al te verwijderen.
+
+        Zo kan het nog teruggezet worden; wordt schedule() niet meer
+        aangeroepen, dan ruimt een volgende sweep() het op.
+        """
+        trash_dir = trash_dir_for(path)
+        os.makedirs(trash_dir, exist_ok=True)
+        target = os.path.join(trash_dir, f"{os.path.basename(path)}.{time.time_ns()}")
+        os.rename(path, target)
+        return target
+
+    def schedule(self, path: str):
+        """Verwijder `path` (al buiten het kritieke pad) op de achtergrond"""
+        self._queue.put(path)
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._work, name="trash-reaper", daemon=True)
+                self._thread.start()
+
+    def sweep(self, directory: str):
+        """Plan achtergebleven items in de prullenbak van `directory` in"""
+        trash_dir = os.path.join(directory, TRASH_DIRNAME)
+        try:
+            names = os.listdir(trash_dir)
+        except OSError:
+            return
+        for name in names:
+            self.schedule(os.path.join(trash_dir, name))
+
+    def wait(self):
+        """Wacht tot alles wat ingepland is verwijderd is"""
+        self._queue.join()
+
+    def _lower_priority(self):
+        try:
+            # Op Linux geldt setpriority per thread
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), self.niceness)
+        except (AttributeError, OSError):
+            pass
+
+    def _work(self):
+        self._lower_priority()
+        while True:
+            path = self._queue.get()
+            try:
+                remove_tree(path)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                # Blijft in de prullenbak staan; een volgende sweep probeert het opnieuw
+                pass
+            finally:
+                self._queue.task_done()